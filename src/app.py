@@ -14,7 +14,9 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from src.config import (
     settings,
+    Environment,
     get_cors_config,
+    get_environment,
     is_development,
     is_production,
     is_testing,
@@ -280,32 +282,29 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
             logger.error(f"Error during application shutdown: {e}")
 
 
-def create_app(environment: str = None) -> FastAPI:
+def _compute_app_config(environment: str = None) -> dict:
     """
-    Application factory function.
+    Compute FastAPI constructor arguments for an environment.
 
-    Creates and configures a FastAPI application instance based on the
-    current environment settings.
+    This does not register routers, middleware or the OpenAPI schema, so it
+    is cheap enough to inspect environment-specific settings directly.
 
     Args:
-        environment: Override environment (for testing)
+        environment: Environment name (detected from settings if omitted)
 
     Returns:
-        Configured FastAPI application instance
+        Keyword arguments for the FastAPI constructor
     """
-    # Override environment if specified (useful for testing)
-    if environment:
-        import os
-        os.environ["API_ENV"] = environment
+    if environment is None:
+        environment = get_environment().value
 
-    # Create FastAPI application
     app_config = {
         **get_app_metadata(),
         "lifespan": lifespan,
     }
 
     # Environment-specific configuration
-    if is_production():
+    if environment == Environment.PRODUCTION:
         # Disable docs in production
         app_config.update({
             "debug": False,
@@ -316,12 +315,36 @@ def create_app(environment: str = None) -> FastAPI:
     else:
         # Enable docs in development and test
         app_config.update({
-            "debug": is_development(),
+            "debug": environment == Environment.DEVELOPMENT,
             "docs_url": "/docs",
             "redoc_url": "/redoc",
             "openapi_url": "/openapi.json",
         })
 
+    return app_config
+
+
+def create_app(environment: str = None) -> FastAPI:
+    """
+    Application factory function.
+
+    Creates and configures a FastAPI application instance based on the
+    current environment settings.
+
+    Args:
+        environment: Override environment (for testing)
+
+    Returns:
+        Configured FastAPI application instance
+    """
+    # Override environment if specified (useful for testing)
+    if environment:
+        import os
+        os.environ["API_ENV"] = environment
+
+    # Create FastAPI application for the (possibly overridden) environment
+    app_config = _compute_app_config()
+
     app = FastAPI(**app_config)
 
     # Set up custom OpenAPI schema generation
@@ -7,20 +7,39 @@ structured logging, correlation IDs, and security event detection.
 
 import json
 import logging
+import os
+import threading
+import time
 import uuid
 from datetime import datetime
 from enum import Enum
+from logging.handlers import MemoryHandler, RotatingFileHandler
 from typing import Any, Dict, List, Optional, Union
 from contextvars import ContextVar
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, field, fields
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    # orjson not available, fall back to the standard library encoder
+    orjson = None
+
 # Context variable for correlation ID tracking
 correlation_id_var: ContextVar[Optional[str]] = ContextVar('correlation_id', default=None)
 user_id_var: ContextVar[Optional[str]] = ContextVar('user_id', default=None)
 request_id_var: ContextVar[Optional[str]] = ContextVar('request_id', default=None)
 
 
+def _dumps(data: Dict[str, Any]) -> str:
+    """Serialize audit data to a JSON string, using orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(
+            data, default=str, option=orjson.OPT_NON_STR_KEYS
+        ).decode()
+    return json.dumps(data, default=str)
+
+
 class AuditEventType(Enum):
     """Audit event types for categorization."""
 
@@ -78,7 +97,7 @@ class AuditSeverity(Enum):
     CRITICAL = "critical"
 
 
-@dataclass
+@dataclass(slots=True)
 class AuditEvent:
     """
     Structured audit event data.
@@ -118,29 +137,106 @@ class AuditEvent:
     risk_score: Optional[int] = None
     tags: Optional[List[str]] = None
 
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert audit event to dictionary for logging."""
-        data = asdict(self)
-
-        # Convert enum values to strings
-        data['event_type'] = self.event_type.value
-        data['severity'] = self.severity.value
+    # ISO-8601 timestamp, formatted once at construction
+    _iso_timestamp: str = field(default="", init=False, repr=False, compare=False)
 
-        # Convert timestamp to ISO format
+    def __post_init__(self) -> None:
+        """Format the timestamp once so serialization can reuse it."""
         if isinstance(self.timestamp, (int, float)):
             # Convert Unix timestamp to datetime then to ISO format
-            from datetime import datetime
-            data['timestamp'] = datetime.fromtimestamp(self.timestamp).isoformat()
+            self._iso_timestamp = datetime.fromtimestamp(self.timestamp).isoformat()
         else:
             # Assume it's already a datetime object
-            data['timestamp'] = self.timestamp.isoformat()
+            self._iso_timestamp = self.timestamp.isoformat()
 
-        # Remove None values to keep logs clean
-        return {k: v for k, v in data.items() if v is not None}
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert audit event to dictionary for logging.
+
+        None values are omitted to keep logs clean; nested metadata and
+        tags are referenced, not copied.
+        """
+        data = {
+            'event_type': self.event_type.value,
+            'severity': self.severity.value,
+            'message': self.message,
+            'timestamp': self._iso_timestamp,
+        }
+
+        for name in _OPTIONAL_EVENT_FIELDS:
+            value = getattr(self, name)
+            if value is not None:
+                data[name] = value
+
+        return data
 
     def to_json(self) -> str:
         """Convert audit event to JSON string."""
-        return json.dumps(self.to_dict(), default=str)
+        return _dumps(self.to_dict())
+
+
+# Optional AuditEvent fields in declaration order, resolved once for to_dict()
+_OPTIONAL_EVENT_FIELDS = tuple(
+    f.name for f in fields(AuditEvent)
+    if f.init and f.name not in ('event_type', 'severity', 'message', 'timestamp')
+)
+
+
+# Seconds between timed flushes of buffered audit records
+_FLUSH_INTERVAL = 0.1
+
+
+class _PeriodicFlusher:
+    """
+    Shared timer that flushes buffered audit handlers.
+
+    A single daemon thread is started on demand when a handler first holds
+    buffered records, and exits again once a tick finds nothing to flush.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._pending: set = set()
+        self._thread: Optional[threading.Thread] = None
+
+    def schedule(self, handler: MemoryHandler) -> None:
+        """Flush the handler on the next tick, starting the timer if idle."""
+        with self._lock:
+            self._pending.add(handler)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="audit-flush", daemon=True
+                )
+                self._thread.start()
+
+    def discard(self, handler: MemoryHandler) -> None:
+        """Stop tracking a handler that is being closed."""
+        with self._lock:
+            self._pending.discard(handler)
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                handlers, self._pending = self._pending, set()
+                if not handlers:
+                    self._thread = None
+                    return
+            for handler in handlers:
+                handler.flush()
+
+
+_flusher = _PeriodicFlusher(_FLUSH_INTERVAL)
+
+
+class _BufferedAuditHandler(MemoryHandler):
+    """MemoryHandler that also asks the shared timer to flush its buffer."""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        super().emit(record)
+        if self.buffer:
+            _flusher.schedule(self)
 
 
 class AuditLogger:
@@ -160,6 +256,7 @@ class AuditLogger:
         log_file_path: Optional[str] = None,
         max_file_size: int = 10 * 1024 * 1024,  # 10MB
         backup_count: int = 5,
+        buffer_capacity: int = 256,
     ):
         """
         Initialize audit logger.
@@ -172,16 +269,18 @@ class AuditLogger:
             log_file_path: Path to log file
             max_file_size: Maximum log file size in bytes
             backup_count: Number of backup files to keep
+            buffer_capacity: Number of file records buffered before a write
         """
         self.logger = logging.getLogger(logger_name)
         self.logger.setLevel(log_level)
+        # Handlers registered by this instance; close() removes only these
+        self._handlers: List[logging.Handler] = []
 
-        # Prevent duplicate handlers
-        if not self.logger.handlers:
-            self._setup_handlers(
-                enable_console, enable_file, log_file_path,
-                max_file_size, backup_count
-            )
+        # Handlers are only added when not already registered on the logger
+        self._setup_handlers(
+            enable_console, enable_file, log_file_path,
+            max_file_size, backup_count, buffer_capacity
+        )
 
     def _setup_handlers(
         self,
@@ -190,25 +289,27 @@ class AuditLogger:
         log_file_path: Optional[str],
         max_file_size: int,
         backup_count: int,
+        buffer_capacity: int,
     ) -> None:
-        """Set up logging handlers."""
+        """Set up logging handlers that are not already registered."""
         formatter = logging.Formatter(
             '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
         )
 
         # Console handler
-        if enable_console:
+        if enable_console and not self._has_console_handler():
             console_handler = logging.StreamHandler()
             console_handler.setFormatter(formatter)
-            self.logger.addHandler(console_handler)
+            self._add_handler(console_handler)
 
         # File handler with rotation
         if enable_file:
-            from logging.handlers import RotatingFileHandler
-
             if log_file_path is None:
                 log_file_path = "logs/audit.log"
 
+            if self._has_file_handler(log_file_path):
+                return
+
             # Ensure log directory exists
             Path(log_file_path).parent.mkdir(parents=True, exist_ok=True)
 
@@ -218,7 +319,59 @@ class AuditLogger:
                 backupCount=backup_count
             )
             file_handler.setFormatter(formatter)
-            self.logger.addHandler(file_handler)
+
+            # Batch LOW events; MEDIUM and above are written immediately
+            buffered_handler = _BufferedAuditHandler(
+                capacity=buffer_capacity,
+                flushLevel=logging.WARNING,
+                target=file_handler,
+            )
+            self._add_handler(buffered_handler)
+
+    def _add_handler(self, handler: logging.Handler) -> None:
+        """Register a handler on the logger and remember that we own it."""
+        self.logger.addHandler(handler)
+        self._handlers.append(handler)
+
+    def _has_console_handler(self) -> bool:
+        """Check whether a console handler is already registered."""
+        return any(
+            type(handler) is logging.StreamHandler
+            for handler in self.logger.handlers
+        )
+
+    def _has_file_handler(self, log_file_path: str) -> bool:
+        """Check whether a handler already writes to the given file."""
+        base_filename = os.path.abspath(log_file_path)
+        for handler in self.logger.handlers:
+            # Buffered handlers wrap the file handler as their target
+            target = getattr(handler, 'target', handler)
+            if (
+                isinstance(target, logging.FileHandler)
+                and target.baseFilename == base_filename
+            ):
+                return True
+        return False
+
+    def flush(self) -> None:
+        """Write any buffered audit records to their targets."""
+        for handler in self.logger.handlers:
+            handler.flush()
+
+    def close(self) -> None:
+        """Flush and close the handlers this logger registered."""
+        for handler in self._handlers:
+            self.logger.removeHandler(handler)
+            if isinstance(handler, MemoryHandler):
+                _flusher.discard(handler)
+                target = handler.target
+                # Flushes pending records into the target before detaching it
+                handler.close()
+                if target is not None:
+                    target.close()
+            else:
+                handler.close()
+        self._handlers.clear()
 
     def _get_context(self) -> Dict[str, Any]:
         """Get current request context."""
@@ -293,7 +446,7 @@ class AuditLogger:
         # Log the structured event
         self.logger.log(
             log_level,
-            json.dumps(log_data, default=str),
+            _dumps(log_data),
             extra=extra_data
         )
 
@@ -8,7 +8,7 @@ to automatically log audit events for various operations.
 import functools
 import inspect
 import time
-from typing import Any, Callable, Dict, List, Optional, TypeVar, Union
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, TypeVar, Union
 from datetime import datetime
 
 from .audit_logger import (
@@ -59,13 +59,16 @@ def audit_event(
             # Function implementation
             pass
     """
+    # Normalize once so per-call redaction lookups are O(1)
+    sensitive = frozenset(sensitive_args or ())
+
     def decorator(func: F) -> F:
         @functools.wraps(func)
         async def async_wrapper(*args, **kwargs):
             return await _execute_with_audit_async(
                 func, args, kwargs, event_type, severity,
                 message_template, resource_type, action,
-                log_args, log_result, sensitive_args
+                log_args, log_result, sensitive
             )
 
         @functools.wraps(func)
@@ -73,7 +76,7 @@ def audit_event(
             return _execute_with_audit_sync(
                 func, args, kwargs, event_type, severity,
                 message_template, resource_type, action,
-                log_args, log_result, sensitive_args
+                log_args, log_result, sensitive
             )
 
         # Return appropriate wrapper based on function type
@@ -96,7 +99,7 @@ def _execute_with_audit_sync(
     action: Optional[str],
     log_args: bool,
     log_result: bool,
-    sensitive_args: Optional[List[str]],
+    sensitive_args: FrozenSet[str],
 ) -> Any:
     """Execute synchronous function with audit logging."""
     start_time = time.time()
@@ -121,7 +124,7 @@ def _execute_with_audit_sync(
     # Add arguments to metadata if requested
     if log_args:
         sanitized_args = _sanitize_arguments(
-            bound_args.arguments, sensitive_args or []
+            bound_args.arguments, sensitive_args
         )
         metadata["arguments"] = sanitized_args
 
@@ -198,7 +201,7 @@ async def _execute_with_audit_async(
     action: Optional[str],
     log_args: bool,
     log_result: bool,
-    sensitive_args: Optional[List[str]],
+    sensitive_args: FrozenSet[str],
 ) -> Any:
     """Execute asynchronous function with audit logging."""
     start_time = time.time()
@@ -223,7 +226,7 @@ async def _execute_with_audit_async(
     # Add arguments to metadata if requested
     if log_args:
         sanitized_args = _sanitize_arguments(
-            bound_args.arguments, sensitive_args or []
+            bound_args.arguments, sensitive_args
         )
         metadata["arguments"] = sanitized_args
 
@@ -308,7 +311,7 @@ def _create_audit_message(
 
 def _sanitize_arguments(
     arguments: Dict[str, Any],
-    sensitive_args: List[str],
+    sensitive_args: FrozenSet[str],
 ) -> Dict[str, Any]:
     """Sanitize function arguments for logging."""
     sanitized = {}
@@ -7,7 +7,10 @@ and logs security-relevant events.
 
 import time
 import uuid
-from typing import Callable, Optional
+from collections import defaultdict, deque
+from itertools import groupby
+from operator import itemgetter
+from typing import Callable, Deque, Dict, Iterable, Optional, Tuple
 from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.types import ASGIApp
@@ -357,9 +360,15 @@ class SecurityEventDetector:
     potential security threats and anomalies.
     """
 
+    # Failed attempts retained per IP; bounds memory for noisy sources
+    max_tracked_attempts = 64
+
     def __init__(self):
         """Initialize security event detector."""
-        self.failed_login_attempts = {}  # IP -> count
+        # IP -> timestamps of recent failed attempts, oldest first
+        self.failed_login_attempts: Dict[str, Deque[float]] = defaultdict(
+            lambda: deque(maxlen=self.max_tracked_attempts)
+        )
         self.request_counts = {}  # IP -> count
         self.suspicious_ips = set()
 
@@ -371,31 +380,70 @@ class SecurityEventDetector:
         timestamp: float,
     ) -> None:
         """Analyze login attempt for brute force detection."""
-        if not success:
-            # Track failed attempts per IP
-            if ip_address not in self.failed_login_attempts:
-                self.failed_login_attempts[ip_address] = []
-
-            self.failed_login_attempts[ip_address].append({
-                'username': username,
-                'timestamp': timestamp,
-            })
-
-            # Clean old attempts (older than 1 hour)
-            cutoff_time = timestamp - 3600
-            self.failed_login_attempts[ip_address] = [
-                attempt for attempt in self.failed_login_attempts[ip_address]
-                if attempt['timestamp'] > cutoff_time
-            ]
-
-            # Check for brute force pattern
-            recent_failures = len(self.failed_login_attempts[ip_address])
-            if recent_failures >= 5:  # 5 failures in 1 hour
-                self._log_brute_force_attempt(ip_address, username, recent_failures)
-        else:
+        recent_failures = self._record_login_attempt(ip_address, success, timestamp)
+
+        # Check for brute force pattern
+        if recent_failures >= 5:  # 5 failures in 1 hour
+            self._log_brute_force_attempt(ip_address, username, recent_failures)
+
+    def analyze_login_attempts_batch(
+        self,
+        attempts: Iterable[Tuple[str, str, bool, float]],
+    ) -> None:
+        """
+        Analyze a batch of login attempts for brute force detection.
+
+        Attempts are grouped by IP address, keeping their original order
+        within each IP. One brute force event is logged per run of failures
+        that reaches the threshold, either when a successful login is about
+        to clear the run or at the end of the batch, so a success following
+        a brute force burst is never missed.
+
+        Args:
+            attempts: (ip_address, username, success, timestamp) tuples
+        """
+        ordered = sorted(attempts, key=itemgetter(0))
+        for ip_address, group in groupby(ordered, key=itemgetter(0)):
+            recent_failures = 0
+            failed_username = None
+            for _, username, success, timestamp in group:
+                if success and recent_failures >= 5:  # 5 failures in 1 hour
+                    self._log_brute_force_attempt(
+                        ip_address, failed_username, recent_failures
+                    )
+                recent_failures = self._record_login_attempt(
+                    ip_address, success, timestamp
+                )
+                if not success:
+                    failed_username = username
+
+            if recent_failures >= 5:
+                self._log_brute_force_attempt(
+                    ip_address, failed_username, recent_failures
+                )
+
+    def _record_login_attempt(
+        self,
+        ip_address: str,
+        success: bool,
+        timestamp: float,
+    ) -> int:
+        """Record a login attempt and return the recent failure count for the IP."""
+        if success:
             # Clear failed attempts on successful login
-            if ip_address in self.failed_login_attempts:
-                del self.failed_login_attempts[ip_address]
+            self.failed_login_attempts.pop(ip_address, None)
+            return 0
+
+        # Track failed attempts per IP
+        attempts = self.failed_login_attempts[ip_address]
+        attempts.append(timestamp)
+
+        # Clean old attempts (older than 1 hour)
+        cutoff_time = timestamp - 3600
+        while attempts[0] <= cutoff_time:
+            attempts.popleft()
+
+        return len(attempts)
 
     def _log_brute_force_attempt(
         self,
@@ -34,6 +34,7 @@ from .settings import (
     get_logging_config,
     get_jwt_config,
     get_feature_flags,
+    reload_config,
     print_configuration_summary,
 )
 
@@ -71,6 +72,7 @@ __all__ = [
     "get_jwt_config",
     "get_feature_flags",
     "get_environment",
+    "reload_config",
 
     # Debug functions
     "print_configuration_summary",
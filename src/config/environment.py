@@ -8,8 +8,9 @@ and managing environment-specific configurations.
 import os
 import sys
 from enum import Enum
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 
 
 class Environment(str, Enum):
@@ -20,6 +21,39 @@ class Environment(str, Enum):
     TEST = "test"
 
 
+# Environment variables consulted by detection, in priority order
+_ENVIRONMENT_VARIABLES = ("API_ENV", "ENV", "ENVIRONMENT")
+
+
+@lru_cache(maxsize=8)
+def _resolve_environment(env_values: Tuple[Optional[str], ...], under_pytest: bool) -> Environment:
+    """
+    Resolve the environment from a snapshot of the detection inputs.
+
+    Cached on the snapshot itself, so changing any of the inputs at runtime
+    is picked up by the next detection call.
+
+    Args:
+        env_values: Values of the detection variables, in priority order
+        under_pytest: Whether the process is running under pytest
+
+    Returns:
+        Resolved environment
+    """
+    for var, env_value in zip(_ENVIRONMENT_VARIABLES, env_values):
+        if env_value:
+            env_value = env_value.lower().strip()
+            try:
+                return Environment(env_value)
+            except ValueError:
+                print(f"Warning: Invalid environment value '{env_value}' in {var}")
+
+    if under_pytest:
+        return Environment.TEST
+
+    return Environment.DEVELOPMENT
+
+
 class EnvironmentDetector:
     """Utility class for environment detection and validation."""
 
@@ -38,23 +72,16 @@ class EnvironmentDetector:
         Returns:
             Detected environment
         """
-        # Check environment variables
-        env_vars = ["API_ENV", "ENV", "ENVIRONMENT"]
-        for var in env_vars:
-            env_value = os.getenv(var)
-            if env_value:
-                env_value = env_value.lower().strip()
-                try:
-                    return Environment(env_value)
-                except ValueError:
-                    print(f"Warning: Invalid environment value '{env_value}' in {var}")
-
-        # Check if running in pytest
-        if "pytest" in sys.modules or "PYTEST_CURRENT_TEST" in os.environ:
-            return Environment.TEST
-
-        # Default to development
-        return Environment.DEVELOPMENT
+        environ = os.environ
+        return _resolve_environment(
+            tuple(environ.get(var) for var in _ENVIRONMENT_VARIABLES),
+            "pytest" in sys.modules or "PYTEST_CURRENT_TEST" in environ,
+        )
+
+    @staticmethod
+    def cache_clear() -> None:
+        """Drop memoized detection results."""
+        _resolve_environment.cache_clear()
 
     @staticmethod
     def is_development() -> bool:
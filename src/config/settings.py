@@ -8,11 +8,14 @@ This module provides centralized configuration management with support for:
 - Configuration validation
 """
 
+import copy
 import os
+from functools import lru_cache, wraps
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, TypeVar
 
 from dynaconf import Dynaconf, Validator
+from pydantic import BaseModel, ConfigDict, StrictStr, ValidationError
 
 # Get the project root directory
 PROJECT_ROOT = Path(__file__).parent.parent.parent
@@ -130,6 +133,25 @@ class ConfigurationError(Exception):
     pass
 
 
+class ConfigSchema(BaseModel):
+    """
+    Schema for the settings checked by validate_configuration().
+
+    The schema is compiled once at import; each validation run is a single
+    model_validate() call over the relevant settings. The field types carry
+    the long-standing custom checks; value rules such as the secret key
+    length stay with the Dynaconf validators above.
+    """
+
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
+    debug: bool = False
+    secret_key: str = ""
+    cors_origins: List[StrictStr]
+    database_url: Optional[str] = None
+    sentry_dsn: Optional[str] = None
+
+
 def validate_configuration() -> None:
     """
     Validate the current configuration.
@@ -141,45 +163,59 @@ def validate_configuration() -> None:
         # Trigger validation by accessing a required setting
         _ = settings.app_name
 
-        # Additional custom validations
+        # Validate types and constraints in one pass
+        values = {name: settings.get(name) for name in ConfigSchema.model_fields}
+        try:
+            config = ConfigSchema.model_validate(
+                {name: value for name, value in values.items() if value is not None}
+            )
+        except ValidationError as e:
+            raise ConfigurationError(str(e))
 
         # Get current environment
         current_env = get_environment()
 
         # Database URL validation (not required for test environment)
         if current_env != "test":
-            try:
-                database_url = getattr(settings, "database_url", None)
-                if not database_url:
-                    raise ConfigurationError("Database URL is required for non-test environments")
-                if not isinstance(database_url, str):
-                    raise ConfigurationError("Database URL must be a string")
-            except AttributeError:
+            if not config.database_url:
                 raise ConfigurationError("Database URL is required for non-test environments")
 
         if current_env == "production":
             # Production-specific validations
-            debug_mode = getattr(settings, "debug", False)
-            if debug_mode:
+            if config.debug:
                 raise ConfigurationError("Debug mode should be disabled in production")
 
-            secret_key = getattr(settings, "secret_key", "")
-            if secret_key == "your-super-secret-key-change-this-in-production":
+            if config.secret_key == "your-super-secret-key-change-this-in-production":
                 raise ConfigurationError("Default secret key detected in production")
 
-            sentry_dsn = getattr(settings, "sentry_dsn", None)
-            if not sentry_dsn:
+            if not config.sentry_dsn:
                 raise ConfigurationError("Sentry DSN is required in production")
 
-        # Validate CORS origins format
-        for origin in settings.cors_origins:
-            if not isinstance(origin, str):
-                raise ConfigurationError(f"Invalid CORS origin format: {origin}")
-
     except Exception as e:
         raise ConfigurationError(f"Configuration validation failed: {str(e)}")
 
 
+T = TypeVar("T")
+
+
+def _cached_config(func: Callable[..., T]) -> Callable[..., T]:
+    """
+    Cache a dictionary-returning config getter.
+
+    The settings are read once; every caller gets its own deep copy so a
+    caller mutating the result cannot change what later callers see.
+    """
+    cached = lru_cache(maxsize=None)(func)
+
+    @wraps(func)
+    def getter(*args: Any, **kwargs: Any) -> T:
+        return copy.deepcopy(cached(*args, **kwargs))
+
+    getter.cache_clear = cached.cache_clear
+    return getter
+
+
+@lru_cache(maxsize=None)
 def get_database_url(for_testing: bool = False) -> str:
     """
     Get the database URL for the current environment.
@@ -189,6 +225,9 @@ def get_database_url(for_testing: bool = False) -> str:
 
     Returns:
         Database connection URL
+
+    Note:
+        Results are cached; call reload_config() after changing settings.
     """
     if for_testing:
         return settings.get("test_database_url", settings.database_url.replace("/api_", "/api_test_"))
@@ -196,6 +235,7 @@ def get_database_url(for_testing: bool = False) -> str:
     return settings.database_url
 
 
+@lru_cache(maxsize=None)
 def get_redis_url() -> str:
     """
     Get the Redis URL for the current environment.
@@ -221,12 +261,13 @@ def is_testing() -> bool:
     return get_environment() == "test"
 
 
+@_cached_config
 def get_cors_config() -> Dict[str, Any]:
     """
     Get CORS configuration as a dictionary.
 
     Returns:
-        CORS configuration dictionary
+        CORS configuration dictionary (a copy; safe to mutate)
     """
     return {
         "allow_origins": settings.cors_origins,
@@ -236,12 +277,13 @@ def get_cors_config() -> Dict[str, Any]:
     }
 
 
+@_cached_config
 def get_logging_config() -> Dict[str, Any]:
     """
     Get logging configuration as a dictionary.
 
     Returns:
-        Logging configuration dictionary
+        Logging configuration dictionary (a copy; safe to mutate)
     """
     return {
         "level": settings.log_level,
@@ -250,27 +292,38 @@ def get_logging_config() -> Dict[str, Any]:
     }
 
 
+@_cached_config
 def get_jwt_config() -> Dict[str, Any]:
     """
     Get JWT configuration as a dictionary.
 
     Returns:
-        JWT configuration dictionary
+        JWT configuration dictionary (a copy; safe to mutate)
+
+    Raises:
+        ConfigurationError: If no secret key is configured
     """
+    # One snapshot of the resolved settings instead of a layered lookup per key
+    values = settings.as_dict()
+    secret_key = values.get("SECRET_KEY")
+    if secret_key is None:
+        # Fail loudly instead of caching a config that cannot sign tokens
+        raise ConfigurationError("SECRET_KEY is not configured")
     return {
-        "secret_key": settings.secret_key,
-        "algorithm": settings.algorithm,
-        "access_token_expire_minutes": settings.access_token_expire_minutes,
-        "refresh_token_expire_days": settings.refresh_token_expire_days,
+        "secret_key": secret_key,
+        "algorithm": values.get("ALGORITHM", "HS256"),
+        "access_token_expire_minutes": values.get("ACCESS_TOKEN_EXPIRE_MINUTES", 30),
+        "refresh_token_expire_days": values.get("REFRESH_TOKEN_EXPIRE_DAYS", 7),
     }
 
 
+@_cached_config
 def get_feature_flags() -> Dict[str, bool]:
     """
     Get all feature flags as a dictionary.
 
     Returns:
-        Feature flags dictionary
+        Feature flags dictionary (a copy; safe to mutate)
     """
     return {
         "registration_enabled": settings.get("feature_registration_enabled", True),
@@ -279,6 +332,19 @@ def get_feature_flags() -> Dict[str, bool]:
     }
 
 
+def reload_config() -> None:
+    """Clear cached configuration getters so they re-read settings."""
+    for getter in (
+        get_database_url,
+        get_redis_url,
+        get_cors_config,
+        get_logging_config,
+        get_jwt_config,
+        get_feature_flags,
+    ):
+        getter.cache_clear()
+
+
 def print_configuration_summary() -> None:
     """Print a summary of the current configuration (for debugging)."""
     print(f"Environment: {get_environment()}")
@@ -313,6 +379,7 @@ def apply_deployment_overrides_to_settings():
         for key, value in deployment_overrides.items():
             if hasattr(settings, key):
                 setattr(settings, key, value)
+        reload_config()
 
         # Validate deployment configuration (skip for test environment)
         if get_environment() != "test":
@@ -5,7 +5,8 @@ This module serves as a template for implementing domain-specific controllers.
 It shows common patterns for CRUD operations using the base controller.
 """
 
-from typing import Optional, Dict, Any
+from itertools import count
+from typing import Optional, Dict, Any, List
 from datetime import datetime, timezone
 
 from src.controllers.base import CRUDController
@@ -26,6 +27,22 @@ class UserController(CRUDController[User, UserCreate, UserUpdate]):
         # In-memory storage for demonstration purposes
         # In a real application, this would use a service layer
         self._users_db: Dict[str, Dict[str, Any]] = {}
+        # Email -> user ID index so lookups and duplicate checks skip the scan
+        self._users_by_email: Dict[str, str] = {}
+        # Monotonic ID sequence; IDs are never reused after a delete
+        self._id_sequence = count(1)
+
+    def _next_user_id(self) -> str:
+        """Return a user ID that no stored or deleted user has had."""
+        return f"user_{next(self._id_sequence)}"
+
+    def _store_user(self, user_data: Dict[str, Any]) -> None:
+        """Store a user record and index its email, dropping any replaced entry."""
+        replaced = self._users_db.get(user_data["id"])
+        if replaced is not None:
+            self._users_by_email.pop(replaced["email"], None)
+        self._users_db[user_data["id"]] = user_data
+        self._users_by_email[user_data["email"]] = user_data["id"]
 
     async def create(self, data: UserCreate) -> User:
         """
@@ -38,11 +55,11 @@ class UserController(CRUDController[User, UserCreate, UserUpdate]):
 
         try:
             # Basic duplicate check
-            if any(user.get("email") == data.email for user in self._users_db.values()):
+            if data.email in self._users_by_email:
                 raise ValueError(f"User with email {data.email} already exists")
 
             # Generate simple ID
-            user_id = f"user_{len(self._users_db) + 1}"
+            user_id = self._next_user_id()
 
             # Create user data
             user_data = {
@@ -57,7 +74,7 @@ class UserController(CRUDController[User, UserCreate, UserUpdate]):
             }
 
             # Store in memory (demo only)
-            self._users_db[user_id] = user_data
+            self._store_user(user_data)
 
             # Return user model
             user = User(**user_data)
@@ -67,6 +84,49 @@ class UserController(CRUDController[User, UserCreate, UserUpdate]):
         except Exception as e:
             raise self._handle_error(e, "create_user")
 
+    async def bulk_create(self, data: List[UserCreate]) -> List[User]:
+        """
+        Create several users in one pass.
+
+        Example of a batch operation: duplicates are checked once against a
+        set of known emails and the whole batch is rejected if any collide.
+        """
+        self._log_request("POST", "/users/bulk", count=len(data))
+
+        try:
+            # Single duplicate pass across existing users and the batch itself
+            seen_emails = set()
+            for item in data:
+                if item.email in self._users_by_email or item.email in seen_emails:
+                    raise ValueError(f"User with email {item.email} already exists")
+                seen_emails.add(item.email)
+
+            now = datetime.now(timezone.utc)
+            new_users = [
+                {
+                    "id": self._next_user_id(),
+                    "username": item.username,
+                    "email": item.email,
+                    "full_name": item.full_name,
+                    "is_active": True,
+                    "login_count": 0,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for item in data
+            ]
+
+            # Store in memory (demo only)
+            for user_data in new_users:
+                self._store_user(user_data)
+
+            users = [User(**user_data) for user_data in new_users]
+            self._log_response("POST", "/users/bulk", 201, count=len(users))
+            return users
+
+        except Exception as e:
+            raise self._handle_error(e, "bulk_create_users")
+
     async def get_by_id(self, resource_id: str) -> Optional[User]:
         """
         Get a user by ID.
@@ -150,6 +210,9 @@ class UserController(CRUDController[User, UserCreate, UserUpdate]):
 
             # Update with provided data
             update_dict = data.model_dump(exclude_unset=True)
+            if "email" in update_dict and update_dict["email"] != user_data["email"]:
+                self._users_by_email.pop(user_data["email"], None)
+                self._users_by_email[update_dict["email"]] = resource_id
             user_data.update(update_dict)
             user_data["updated_at"] = datetime.now(timezone.utc)
 
@@ -174,7 +237,8 @@ class UserController(CRUDController[User, UserCreate, UserUpdate]):
                 self._log_response("DELETE", f"/users/{resource_id}", 404)
                 return False
 
-            del self._users_db[resource_id]
+            user_data = self._users_db.pop(resource_id)
+            self._users_by_email.pop(user_data["email"], None)
             self._log_response("DELETE", f"/users/{resource_id}", 204)
             return True
 
@@ -192,11 +256,11 @@ class UserController(CRUDController[User, UserCreate, UserUpdate]):
         self._log_request("GET", f"/users/by-email/{email}")
 
         try:
-            for user_data in self._users_db.values():
-                if user_data.get("email") == email:
-                    user = User(**user_data)
-                    self._log_response("GET", f"/users/by-email/{email}", 200)
-                    return user
+            user_id = self._users_by_email.get(email)
+            if user_id is not None:
+                user = User(**self._users_db[user_id])
+                self._log_response("GET", f"/users/by-email/{email}", 200)
+                return user
 
             self._log_response("GET", f"/users/by-email/{email}", 404)
             return None
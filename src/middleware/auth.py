@@ -5,10 +5,21 @@ This module provides extensible authentication middleware supporting
 JWT tokens, OAuth2, and API key authentication methods.
 """
 
+import asyncio
+import base64
+import hashlib
+import json
 import logging
+import math
+import os
+import time
 from abc import ABC, abstractmethod
+from calendar import timegm
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Union
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple, Union
 from fastapi import HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from starlette.middleware.base import BaseHTTPMiddleware
@@ -16,6 +27,18 @@ from starlette.types import ASGIApp
 import jwt
 from passlib.context import CryptContext
 
+try:
+    import orjson
+except ImportError:
+    # orjson not available, fall back to the standard library JSON module
+    orjson = None
+
+# Prefer the bcrypt C extension directly; passlib adds per-call dispatch overhead
+try:
+    import bcrypt as _bcrypt
+except ImportError:  # pragma: no cover - passlib[bcrypt] normally provides it
+    _bcrypt = None
+
 # Import configuration functions with fallback for testing
 try:
     from src.config.settings import settings, is_development
@@ -34,6 +57,105 @@ except Exception:
 
 logger = logging.getLogger(__name__)
 
+# Shared JWS signer; claims are serialized by this module
+_jws = jwt.PyJWS()
+
+# Registered claims PyJWT accepts as datetimes and converts to epoch seconds
+_TIME_CLAIMS = ("exp", "iat", "nbf")
+
+
+def _is_json_native(value: Any) -> bool:
+    """Check that a value is built only from types orjson and json encode alike."""
+    kind = type(value)
+    if kind is str or kind is bool or value is None:
+        return True
+    if kind is int:
+        # orjson only handles 64-bit integers
+        return -(2 ** 63) <= value < 2 ** 64
+    if kind is float:
+        # json writes NaN/Infinity where orjson writes null
+        return math.isfinite(value)
+    if kind is list or kind is tuple:
+        return all(_is_json_native(item) for item in value)
+    if kind is dict:
+        return all(
+            type(key) is str and _is_json_native(item)
+            for key, item in value.items()
+        )
+    return False
+
+
+def _json_dumps(data: Dict[str, Any]) -> bytes:
+    """
+    Serialize JWT claims compactly, exactly as PyJWT's json encoding would.
+
+    orjson is only used for plain JSON payloads, where both encoders agree;
+    anything else (datetimes, UUIDs, non-str keys) goes through json so a
+    token never depends on whether orjson is installed.
+    """
+    if orjson is not None and _is_json_native(data):
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+
+# HMAC algorithms signed directly instead of through PyJWS
+_HMAC_ALGORITHMS = frozenset({"HS256", "HS384", "HS512"})
+
+
+@lru_cache(maxsize=16)
+def _hmac_signer(secret_key: str, algorithm: str) -> Tuple[Any, bytes]:
+    """
+    PyJWT's HMAC algorithm and prepared key for a secret.
+
+    prepare_key keeps PyJWT's guard against PEM/SSH-looking keys being used
+    as HMAC secrets; the result is cached because the secret rarely changes.
+
+    Raises:
+        jwt.InvalidKeyError: If the secret looks like an asymmetric key
+    """
+    algorithm_obj = _jws.get_algorithm_by_name(algorithm)
+    return algorithm_obj, algorithm_obj.prepare_key(secret_key)
+
+
+def _b64url(data: bytes) -> bytes:
+    """Base64url-encode without padding, as JWS segments require."""
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+@lru_cache(maxsize=None)
+def _header_segment(algorithm: str) -> bytes:
+    """Encoded JWT header for an algorithm; it never varies between tokens."""
+    return _b64url(_json_dumps({"alg": algorithm, "typ": "JWT"}))
+
+
+def _encode_claims(claims: Dict[str, Any], secret_key: str, algorithm: str) -> str:
+    """
+    Serialize and sign JWT claims.
+
+    HMAC-signed tokens reuse a pre-encoded header and a cached, validated
+    key; other algorithms go through PyJWS.
+
+    Args:
+        claims: Claims to encode; datetime time claims become epoch seconds
+        secret_key: Signing key
+        algorithm: JWT algorithm to use
+
+    Returns:
+        Encoded JWT token
+    """
+    for claim in _TIME_CLAIMS:
+        value = claims.get(claim)
+        if isinstance(value, datetime):
+            claims[claim] = timegm(value.utctimetuple())
+
+    if algorithm not in _HMAC_ALGORITHMS:
+        return _jws.encode(_json_dumps(claims), secret_key, algorithm=algorithm)
+
+    algorithm_obj, key = _hmac_signer(secret_key, algorithm)
+    signing_input = _header_segment(algorithm) + b"." + _b64url(_json_dumps(claims))
+    signature = algorithm_obj.sign(signing_input, key)
+    return (signing_input + b"." + _b64url(signature)).decode("ascii")
+
 
 class AuthenticationBackend(ABC):
     """
@@ -43,6 +165,10 @@ class AuthenticationBackend(ABC):
     must implement.
     """
 
+    # Whether authenticate() waits on a remote service (e.g. token
+    # introspection); such backends may be overlapped with each other
+    network_bound: bool = False
+
     @abstractmethod
     async def authenticate(self, request: Request) -> Optional[Dict[str, Any]]:
         """
@@ -79,7 +205,9 @@ class JWTAuthenticationBackend(AuthenticationBackend):
         secret_key: str,
         algorithm: str = "HS256",
         token_url: str = "/auth/token",
-        auto_error: bool = True
+        auto_error: bool = True,
+        cache_size: int = 10000,
+        cache_ttl: float = 30.0
     ):
         """
         Initialize JWT authentication backend.
@@ -89,12 +217,79 @@ class JWTAuthenticationBackend(AuthenticationBackend):
             algorithm: JWT algorithm to use
             token_url: URL for token endpoint
             auto_error: Whether to automatically raise errors
+            cache_size: Maximum number of verified payloads to keep cached
+            cache_ttl: Seconds a verified payload stays cached
         """
         self.secret_key = secret_key
         self.algorithm = algorithm
         self.token_url = token_url
         self.auto_error = auto_error
         self.bearer = HTTPBearer(auto_error=auto_error)
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        # token digest -> (cache expiry, verified payload)
+        self._payload_cache: "OrderedDict[bytes, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+    def _decode_token(self, token: str) -> Dict[str, Any]:
+        """
+        Decode a JWT token, reusing a recently verified payload when possible.
+
+        Args:
+            token: Encoded JWT token
+
+        Returns:
+            Verified token payload
+
+        Raises:
+            jwt.ExpiredSignatureError: If a cached payload has expired
+            jwt.InvalidTokenError: If the token fails verification
+        """
+        # Reject anything that is not header.payload.signature before hashing
+        if token.count(".") != 2:
+            raise jwt.DecodeError("Not enough segments")
+
+        key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+        now = time.time()
+
+        cached = self._payload_cache.get(key)
+        if cached is not None:
+            cached_until, payload = cached
+            if now < cached_until:
+                exp = payload.get("exp")
+                if exp and now > exp:
+                    del self._payload_cache[key]
+                    raise jwt.ExpiredSignatureError("Signature has expired")
+                return payload
+            del self._payload_cache[key]
+
+        payload = self._verify_token(token)
+
+        if self.cache_size > 0:
+            self._payload_cache[key] = (now + self.cache_ttl, payload)
+            if len(self._payload_cache) > self.cache_size:
+                self._payload_cache.popitem(last=False)
+
+        return payload
+
+    def _verify_token(self, token: str) -> Dict[str, Any]:
+        """
+        Verify a JWT token and validate its registered claims.
+
+        Only called on a cache miss; the full PyJWT decoder runs so that the
+        signature and the exp, nbf, iat, aud and sub claims are all checked
+        before a payload can be cached.
+
+        Args:
+            token: Encoded JWT token
+
+        Returns:
+            Verified token payload
+
+        Raises:
+            jwt.InvalidTokenError: If the token fails verification or any
+                registered claim is invalid
+        """
+        return jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
 
     async def authenticate(self, request: Request) -> Optional[Dict[str, Any]]:
         """
@@ -112,12 +307,8 @@ class JWTAuthenticationBackend(AuthenticationBackend):
             if not credentials:
                 return None
 
-            # Verify and decode token
-            payload = jwt.decode(
-                credentials.credentials,
-                self.secret_key,
-                algorithms=[self.algorithm]
-            )
+            # Verify and decode token (cached briefly by token digest)
+            payload = self._decode_token(credentials.credentials)
 
             # Check token expiration
             exp = payload.get("exp")
@@ -130,8 +321,9 @@ class JWTAuthenticationBackend(AuthenticationBackend):
                 "user_id": payload.get("sub"),
                 "username": payload.get("username"),
                 "email": payload.get("email"),
-                "roles": payload.get("roles", []),
-                "permissions": payload.get("permissions", []),
+                # Copies, so callers cannot mutate the cached payload
+                "roles": list(payload.get("roles", [])),
+                "permissions": list(payload.get("permissions", [])),
                 "token_type": payload.get("token_type", "access"),
                 "exp": exp,
                 "iat": payload.get("iat"),
@@ -190,20 +382,18 @@ class JWTAuthenticationBackend(AuthenticationBackend):
         """
         to_encode = data.copy()
 
-        if expires_delta:
-            expire = datetime.utcnow() + expires_delta
-        else:
-            expire = datetime.utcnow() + timedelta(
-                minutes=settings.access_token_expire_minutes
-            )
+        if not expires_delta:
+            expires_delta = timedelta(minutes=settings.access_token_expire_minutes)
 
+        # One clock read; exp/iat are plain epoch seconds (RFC 7519 NumericDate)
+        now = int(time.time())
         to_encode.update({
-            "exp": expire,
-            "iat": datetime.utcnow(),
+            "exp": now + int(expires_delta.total_seconds()),
+            "iat": now,
             "token_type": "access"
         })
 
-        encoded_jwt = jwt.encode(to_encode, self.secret_key, algorithm=self.algorithm)
+        encoded_jwt = _encode_claims(to_encode, self.secret_key, self.algorithm)
         return encoded_jwt
 
     def create_refresh_token(
@@ -223,20 +413,18 @@ class JWTAuthenticationBackend(AuthenticationBackend):
         """
         to_encode = data.copy()
 
-        if expires_delta:
-            expire = datetime.utcnow() + expires_delta
-        else:
-            expire = datetime.utcnow() + timedelta(
-                days=settings.refresh_token_expire_days
-            )
+        if not expires_delta:
+            expires_delta = timedelta(days=settings.refresh_token_expire_days)
 
+        # One clock read; exp/iat are plain epoch seconds (RFC 7519 NumericDate)
+        now = int(time.time())
         to_encode.update({
-            "exp": expire,
-            "iat": datetime.utcnow(),
+            "exp": now + int(expires_delta.total_seconds()),
+            "iat": now,
             "token_type": "refresh"
         })
 
-        encoded_jwt = jwt.encode(to_encode, self.secret_key, algorithm=self.algorithm)
+        encoded_jwt = _encode_claims(to_encode, self.secret_key, self.algorithm)
         return encoded_jwt
 
 
@@ -278,12 +466,11 @@ class APIKeyAuthenticationBackend(AuthenticationBackend):
         Returns:
             User information associated with API key
         """
-        # Try to get API key from header
-        api_key = request.headers.get(self.header_name)
-
-        # If not in header, try query parameter
-        if not api_key:
-            api_key = request.query_params.get(self.query_param)
+        # Try to get API key from header, then from the query parameter
+        api_key = (
+            request.headers.get(self.header_name)
+            or request.query_params.get(self.query_param)
+        )
 
         if not api_key:
             if self.auto_error:
@@ -294,7 +481,7 @@ class APIKeyAuthenticationBackend(AuthenticationBackend):
                 )
             return None
 
-        # Validate API key
+        # Validate API key (a single hash lookup; keys are high-entropy)
         user_info = self.api_keys.get(api_key)
         if not user_info:
             logger.warning(f"Invalid API key attempted: {api_key[:8]}...")
@@ -306,12 +493,8 @@ class APIKeyAuthenticationBackend(AuthenticationBackend):
                 )
             return None
 
-        # Add API key info to user data
-        user_info = user_info.copy()
-        user_info["api_key"] = api_key[:8] + "..."  # Masked for logging
-        user_info["auth_method"] = "api_key"
-
-        return user_info
+        # Add API key info to user data (key masked for logging)
+        return {**user_info, "api_key": api_key[:8] + "...", "auth_method": "api_key"}
 
     def get_scheme_name(self) -> str:
         """Get API key scheme name."""
@@ -325,6 +508,9 @@ class OAuth2AuthenticationBackend(AuthenticationBackend):
     This backend handles OAuth2 token validation.
     """
 
+    # Real validation calls out to the OAuth2 provider
+    network_bound = True
+
     def __init__(
         self,
         token_url: str = "/auth/token",
@@ -442,6 +628,9 @@ class AuthenticationMiddleware(BaseHTTPMiddleware):
             "/readyz",
             "/metrics",
         ]
+        # Exempt paths match by prefix; a trailing "*" is accepted and ignored
+        self._exempt_exact = frozenset(p.rstrip("*") for p in self.exempt_paths)
+        self._exempt_prefixes = tuple(self._exempt_exact)
         self.require_auth = require_auth
 
     async def dispatch(self, request: Request, call_next) -> Any:
@@ -460,22 +649,7 @@ class AuthenticationMiddleware(BaseHTTPMiddleware):
             return await call_next(request)
 
         # Try authentication backends
-        user_info = None
-        auth_backend = None
-
-        for backend in self.backends:
-            try:
-                user_info = await backend.authenticate(request)
-                if user_info:
-                    auth_backend = backend
-                    break
-            except HTTPException:
-                # If backend raises an exception, re-raise it
-                raise
-            except Exception as e:
-                # Log unexpected errors but continue to next backend
-                logger.error(f"Authentication backend {backend.get_scheme_name()} error: {e}")
-                continue
+        user_info, auth_backend = await self._authenticate(request)
 
         # Set authentication information in request state
         request.state.user = user_info
@@ -529,6 +703,83 @@ class AuthenticationMiddleware(BaseHTTPMiddleware):
 
         return await call_next(request)
 
+    async def _authenticate(
+        self, request: Request
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[AuthenticationBackend]]:
+        """
+        Run the authentication backends with configured-order precedence.
+
+        Local backends are tried first, in order, stopping at the first one
+        that authenticates or rejects the request. Only network-bound
+        backends configured ahead of that point are then started; they run
+        concurrently so their latencies overlap, but a later backend's
+        outcome is only used once every earlier one has returned None.
+
+        Args:
+            request: FastAPI request object
+
+        Returns:
+            Tuple of user information and the backend that produced it
+
+        Raises:
+            HTTPException: If the deciding backend rejected the request
+        """
+        # backend index -> user information or HTTPException
+        outcomes: Dict[int, Any] = {}
+        cutoff = len(self.backends)
+
+        for index, backend in enumerate(self.backends):
+            if backend.network_bound:
+                continue
+            outcome = await self._run_backend(backend, request)
+            if outcome:
+                outcomes[index] = outcome
+                cutoff = index
+                break
+
+        network = [i for i in range(cutoff) if self.backends[i].network_bound]
+        if network:
+            async with asyncio.TaskGroup() as tg:
+                tasks = {
+                    i: tg.create_task(self._run_backend(self.backends[i], request))
+                    for i in network
+                }
+                for index in network:
+                    outcome = await tasks[index]
+                    if outcome:
+                        outcomes[index] = outcome
+                        for task in tasks.values():
+                            task.cancel()
+                        break
+
+        if not outcomes:
+            return None, None
+
+        index = min(outcomes)
+        if isinstance(outcomes[index], HTTPException):
+            raise outcomes[index]
+        return outcomes[index], self.backends[index]
+
+    async def _run_backend(self, backend: AuthenticationBackend, request: Request) -> Any:
+        """
+        Run one backend, returning its rejection instead of raising it.
+
+        Args:
+            backend: Authentication backend to run
+            request: FastAPI request object
+
+        Returns:
+            User information, an HTTPException, or None
+        """
+        try:
+            return await backend.authenticate(request)
+        except HTTPException as e:
+            return e
+        except Exception as e:
+            # Log unexpected errors but continue to the next backend
+            logger.error(f"Authentication backend {backend.get_scheme_name()} error: {e}")
+            return None
+
     def _is_exempt_path(self, path: str) -> bool:
         """
         Check if path is exempt from authentication.
@@ -539,10 +790,7 @@ class AuthenticationMiddleware(BaseHTTPMiddleware):
         Returns:
             True if path is exempt
         """
-        for exempt_path in self.exempt_paths:
-            if path.startswith(exempt_path):
-                return True
-        return False
+        return path in self._exempt_exact or path.startswith(self._exempt_prefixes)
 
     def _get_client_ip(self, request: Request) -> Optional[str]:
         """
@@ -578,6 +826,15 @@ class AuthenticationMiddleware(BaseHTTPMiddleware):
 # Password hashing utilities
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# bcrypt only uses the first 72 bytes of a password
+_BCRYPT_MAX_PASSWORD_BYTES = 72
+
+# bcrypt releases the GIL, so hashing in threads keeps the event loop free
+_BCRYPT_POOL = ThreadPoolExecutor(
+    max_workers=min(4, os.cpu_count() or 1),
+    thread_name_prefix="bcrypt",
+)
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
@@ -590,7 +847,16 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     Returns:
         True if password matches
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    if _bcrypt is None or not hashed_password.startswith(("$2a$", "$2b$", "$2y$")):
+        return pwd_context.verify(plain_password, hashed_password)
+
+    try:
+        return _bcrypt.checkpw(
+            plain_password.encode("utf-8")[:_BCRYPT_MAX_PASSWORD_BYTES],
+            hashed_password.encode("ascii"),
+        )
+    except ValueError:
+        return False
 
 
 def get_password_hash(password: str) -> str:
@@ -603,7 +869,44 @@ def get_password_hash(password: str) -> str:
     Returns:
         Hashed password
     """
-    return pwd_context.hash(password)
+    if _bcrypt is None:
+        return pwd_context.hash(password)
+
+    return _bcrypt.hashpw(
+        password.encode("utf-8")[:_BCRYPT_MAX_PASSWORD_BYTES],
+        _bcrypt.gensalt(),
+    ).decode("ascii")
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verify a password against its hash without blocking the event loop.
+
+    Args:
+        plain_password: Plain text password
+        hashed_password: Hashed password
+
+    Returns:
+        True if password matches
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _BCRYPT_POOL, verify_password, plain_password, hashed_password
+    )
+
+
+async def hash_password_async(password: str) -> str:
+    """
+    Hash a password without blocking the event loop.
+
+    Args:
+        password: Plain text password
+
+    Returns:
+        Hashed password
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_BCRYPT_POOL, get_password_hash, password)
 
 
 # Convenience functions for creating authentication backends
@@ -615,9 +918,12 @@ def create_jwt_backend(
     """
     Create a JWT authentication backend with default settings.
 
+    The backend signs and verifies with a single shared secret, so only
+    the HMAC algorithms (HS256, HS384, HS512) are usable.
+
     Args:
         secret_key: JWT secret key (uses settings if not provided)
-        algorithm: JWT algorithm
+        algorithm: JWT HMAC algorithm
         auto_error: Whether to automatically raise errors
 
     Returns:
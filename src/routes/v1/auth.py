@@ -14,8 +14,9 @@ from pydantic import BaseModel, EmailStr
 from src.auth import Permission, require_permission, get_current_user
 from src.middleware.auth import (
     create_jwt_backend,
-    verify_password,
-    get_password_hash
+    get_password_hash,
+    hash_password_async,
+    verify_password_async
 )
 from src.schemas.base import SuccessResponse
 from src.audit.audit_logger import (
@@ -83,7 +84,7 @@ MOCK_USERS = {
 }
 
 
-def authenticate_user(username: str, password: str) -> Dict[str, Any] | None:
+async def authenticate_user(username: str, password: str) -> Dict[str, Any] | None:
     """
     Authenticate user with username and password.
 
@@ -98,7 +99,8 @@ def authenticate_user(username: str, password: str) -> Dict[str, Any] | None:
     if not user:
         return None
 
-    if not verify_password(password, user["hashed_password"]):
+    # bcrypt runs in the worker pool so logins do not stall the event loop
+    if not await verify_password_async(password, user["hashed_password"]):
         return None
 
     return user
@@ -121,7 +123,7 @@ async def login_for_access_token(
         HTTPException: If authentication fails
     """
     # Authenticate user
-    user = authenticate_user(form_data.username, form_data.password)
+    user = await authenticate_user(form_data.username, form_data.password)
     if not user:
         # Log failed authentication
         log_authentication_event(
@@ -278,12 +280,13 @@ async def register_user(user_data: UserRegistration) -> SuccessResponse:
         )
 
     # Create new user
+    hashed_password = await hash_password_async(user_data.password)
     new_user = {
         "user_id": f"user_{len(MOCK_USERS) + 1}",
         "username": user_data.username,
         "email": user_data.email,
         "full_name": user_data.full_name,
-        "hashed_password": get_password_hash(user_data.password),
+        "hashed_password": hashed_password,
         "roles": ["user"],  # Default role
         "permissions": ["user:read", "content:read", "content:write"],
         "is_active": True,
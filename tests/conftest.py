@@ -7,6 +7,7 @@ for different application domains.
 """
 
 import asyncio
+import functools
 import os
 import pytest
 import pytest_asyncio
@@ -16,19 +17,27 @@ from unittest.mock import AsyncMock, MagicMock
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
 from httpx import AsyncClient
-from sqlalchemy import create_engine, event
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.pool import StaticPool
 
+# Session-wide environment flags. They must be set before the src imports
+# below: importing src.config runs initialize_configuration() unless
+# SKIP_CONFIG_INIT is already set.
+SESSION_ENV_VARS = {
+    "API_ENV": "test",
+    "SKIP_CONFIG_INIT": "1",
+    "SKIP_CONFIG_VALIDATION": "1",
+}
+os.environ.update(SESSION_ENV_VARS)
+
 # Import application components
-from src.app import get_application
+from src.app import create_app, get_application
 from src.database.base import Base
 from src.database.config import get_session_dependency
 from src.dependencies import get_current_user, get_request_context
 
-
 # Test database URL - use in-memory SQLite for fast tests
-TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
+from tests.test_config import TEST_DATABASE_URL
 
 # Global test engine and session factory
 test_engine = None
@@ -169,6 +178,49 @@ def app(db_session: AsyncSession, override_dependencies: Dict) -> FastAPI:
     app.dependency_overrides.clear()
 
 
+@functools.lru_cache(maxsize=None)
+def _cached_app(environment: str) -> FastAPI:
+    """
+    Build and memoize an application per environment name.
+
+    Routes and middleware are not mutated by the tests that use this
+    cache, so sharing one instance per environment is safe.
+
+    Args:
+        environment: Environment name passed to create_app
+
+    Returns:
+        Cached FastAPI application for the environment
+    """
+    return create_app(environment)
+
+
+@pytest.fixture(scope="session")
+def app_for() -> Generator:
+    """
+    Provide a factory returning session-cached applications by environment.
+
+    create_app() exports API_ENV as a side effect; the factory preserves
+    that on cache hits and the original value is restored at session end.
+
+    Yields:
+        Callable mapping an environment name to a FastAPI application
+    """
+    original_env = os.environ.get("API_ENV")
+
+    def factory(environment: str) -> FastAPI:
+        os.environ["API_ENV"] = environment
+        return _cached_app(environment)
+
+    yield factory
+
+    _cached_app.cache_clear()
+    if original_env is None:
+        os.environ.pop("API_ENV", None)
+    else:
+        os.environ["API_ENV"] = original_env
+
+
 @pytest.fixture
 def client(app: FastAPI) -> Generator[TestClient, None, None]:
     """
@@ -412,6 +464,10 @@ def pytest_configure(config):
     config.addinivalue_line(
         "markers", "database: mark test as requiring database"
     )
+    config.addinivalue_line(
+        "markers",
+        "xdist_group(name): run tests sharing expensive fixtures on one xdist worker",
+    )
 
 
 def pytest_collection_modifyitems(config, items):
@@ -18,6 +18,11 @@ from uuid import uuid4
 class MockUser:
     """Mock User model for testing."""
     
+    __slots__ = (
+        "id", "username", "email", "first_name", "last_name", "is_active",
+        "is_verified", "created_at", "updated_at", "roles", "permissions",
+    )
+    
     def __init__(self, **kwargs):
         self.id = kwargs.get('id', str(uuid4()))
         self.username = kwargs.get('username', 'testuser')
@@ -35,6 +40,11 @@ class MockUser:
 class MockPost:
     """Mock Post model for testing."""
     
+    __slots__ = (
+        "id", "title", "content", "author_id", "is_published",
+        "created_at", "updated_at",
+    )
+    
     def __init__(self, **kwargs):
         self.id = kwargs.get('id', str(uuid4()))
         self.title = kwargs.get('title', 'Test Post')
@@ -48,6 +58,11 @@ class MockPost:
 class MockComment:
     """Mock Comment model for testing."""
     
+    __slots__ = (
+        "id", "content", "post_id", "author_id", "is_approved",
+        "created_at", "updated_at",
+    )
+    
     def __init__(self, **kwargs):
         self.id = kwargs.get('id', str(uuid4()))
         self.content = kwargs.get('content', 'Test comment')
@@ -0,0 +1,93 @@
+"""
+Integration tests for relationship loading behaviour.
+
+The unit model tests wire relationships by hand; these tests run real
+queries so that an accidental switch to per-row lazy loading (N+1 queries)
+shows up as a failing statement count.
+"""
+
+import pytest
+from sqlalchemy import event, select
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload
+
+from src.database.models import Post, User
+
+
+@pytest.fixture
+def statement_log(db_session: AsyncSession):
+    """
+    Record SQL statements executed through the test session's engine.
+    
+    Args:
+        db_session: Database session fixture
+    
+    Yields:
+        List that collects statement strings as they execute
+    """
+    statements = []
+    engine = db_session.bind.sync_engine
+    
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    event.listen(engine, "before_cursor_execute", record)
+    yield statements
+    event.remove(engine, "before_cursor_execute", record)
+
+
+async def _seed_users_with_posts(session: AsyncSession, users: int, posts_per_user: int):
+    """Insert users with posts and detach them so later reads hit the database."""
+    for i in range(users):
+        user = User(
+            username=f"loader{i}",
+            email=f"loader{i}@example.com",
+            hashed_password="hashed_password_123"
+        )
+        user.posts = [
+            Post(title=f"Post {i}-{j}", content="Body", view_count=0)
+            for j in range(posts_per_user)
+        ]
+        session.add(user)
+    
+    await session.flush()
+    session.expunge_all()
+
+
+@pytest.mark.integration
+@pytest.mark.database
+class TestRelationshipLoading:
+    """Guard the eager-loading contract of the example models."""
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("user_count", [1, 5])
+    async def test_user_posts_load_without_n_plus_one(
+        self, db_session: AsyncSession, statement_log, user_count
+    ):
+        """Test loading users and their posts costs a constant number of queries."""
+        await _seed_users_with_posts(db_session, users=user_count, posts_per_user=3)
+        statement_log.clear()
+        
+        result = await db_session.execute(select(User).where(User.username.like("loader%")))
+        users = result.scalars().all()
+        post_counts = [len(user.posts) for user in users]
+        
+        assert post_counts == [3] * user_count
+        # One SELECT for users plus one batched SELECT for all their posts
+        assert len(statement_log) == 2
+    
+    @pytest.mark.asyncio
+    async def test_unloaded_posts_raise_instead_of_lazy_loading(
+        self, db_session: AsyncSession
+    ):
+        """Test that suppressing the eager load surfaces as an error, not a query."""
+        await _seed_users_with_posts(db_session, users=1, posts_per_user=1)
+        
+        result = await db_session.execute(
+            select(User).where(User.username == "loader0").options(raiseload(User.posts))
+        )
+        user = result.scalar_one()
+        
+        with pytest.raises(InvalidRequestError):
+            user.posts
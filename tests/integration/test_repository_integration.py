@@ -0,0 +1,52 @@
+"""
+Integration tests for repositories against a real database session.
+
+These tests use the shared ``db_session`` fixture: tables are created once
+per session on the in-memory engine and each test runs inside a transaction
+that is rolled back at teardown, so no test pays for DDL or re-population.
+"""
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database.repositories import RepositoryFactory
+
+
+@pytest.mark.integration
+@pytest.mark.database
+class TestRepositoryIntegration:
+    """Exercise repository queries end to end."""
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("attempt", [1, 2])
+    async def test_created_rows_are_rolled_back(self, db_session: AsyncSession, attempt):
+        """Test each run can create the same unique user, proving rollback isolation."""
+        users = RepositoryFactory(db_session).users
+        
+        user = await users.create(
+            username="repo_user",
+            email="repo_user@example.com",
+            hashed_password="hashed_password_123"
+        )
+        
+        assert await users.count() == 1
+        assert await users.get_by_username("repo_user") is user
+    
+    @pytest.mark.asyncio
+    async def test_user_repository_crud(self, db_session: AsyncSession):
+        """Test create, lookup, update and delete through the user repository."""
+        users = RepositoryFactory(db_session).users
+        
+        user = await users.create(
+            username="crud_user",
+            email="crud_user@example.com",
+            hashed_password="hashed_password_123"
+        )
+        assert await users.exists(user.id)
+        assert await users.get_by_email("crud_user@example.com") is user
+        
+        updated = await users.update(user.id, full_name="Crud User")
+        assert updated.full_name == "Crud User"
+        
+        assert await users.delete(user.id) is True
+        assert await users.exists(user.id) is False
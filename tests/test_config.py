@@ -98,6 +98,9 @@ class ConfigForTesting:
 # Global test configuration instance
 test_config = ConfigForTesting.from_env()
 
+# In-memory database shared by conftest fixtures and engine tests
+TEST_DATABASE_URL = ConfigForTesting.database_url
+
 
 class TestCategories:
     """
@@ -415,6 +418,7 @@ class TestAssertions:
 # Export commonly used items
 __all__ = [
     "test_config",
+    "TEST_DATABASE_URL",
     "ConfigForTesting",
     "TestCategories",
     "TestData",
@@ -19,6 +19,11 @@ from src.database.models import User, Post
 from src.config.settings import settings
 
 
+# Every test shares ./test_migrations.db and deletes it on teardown, so the
+# module must stay on one xdist worker
+pytestmark = pytest.mark.xdist_group(name="migrations")
+
+
 @pytest.mark.asyncio
 class TestMigrations:
     """Test database migrations functionality."""
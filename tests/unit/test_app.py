@@ -2,51 +2,75 @@
 Tests for FastAPI application.
 """
 
+import httpx
 import pytest
+import pytest_asyncio
 from fastapi.testclient import TestClient
 
-# Set test environment before importing app
-import os
-os.environ["API_ENV"] = "test"
-os.environ["SKIP_CONFIG_INIT"] = "1"
-os.environ["SKIP_CONFIG_VALIDATION"] = "1"
+from src.app import _compute_app_config
 
-from src.app import create_app
+
+# Keep app-building tests on one xdist worker so cached apps are reused
+pytestmark = pytest.mark.xdist_group(name="fastapi_app")
 
 
 class TestFastAPIApplication:
     """Test FastAPI application creation and configuration."""
     
-    @pytest.fixture
-    def app(self):
+    @pytest.fixture(scope="class")
+    def app(self, app_for):
         """Create test application."""
-        return create_app("test")
+        return app_for("test")
     
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def client(self, app):
         """Create test client."""
         return TestClient(app)
     
+    @pytest_asyncio.fixture
+    async def async_client(self, app):
+        """Create asynchronous test client bound to the application."""
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            yield client
+    
     def test_create_app(self, app):
         """Test application creation."""
         assert app is not None
         assert app.title == "Generic API Framework"
         assert app.version == "0.1.0"
     
-    def test_health_check_endpoint(self, client):
+    @pytest.mark.asyncio
+    async def test_health_check_endpoint(self, async_client):
         """Test health check endpoint."""
-        response = client.get("/healthz")
+        response = await async_client.get("/healthz")
         assert response.status_code == 200
         
-        response_data = response.json()
-        assert response_data["success"] is True
-        assert "data" in response_data
+        body = response.json()
+        assert body["success"] is True
+        assert body["data"]["status"] == "healthy"
+        assert {"timestamp", "version", "environment"} <= body["data"].keys()
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "path, expected_status, expected_values, expected_keys",
+        [
+            ("/api/", 200, {"message": "Generic API Framework"}, {"version", "health_url"}),
+            ("/api/v1/", 200, {"message": "API Version 1", "version": "1.0"}, set()),
+            ("/api/v1/status", 200, {"status": "operational", "version": "1.0"}, {"features"}),
+        ],
+    )
+    async def test_endpoints(
+        self, async_client, path, expected_status, expected_values, expected_keys
+    ):
+        """Test that public endpoints respond with the expected payload."""
+        response = await async_client.get(path)
+        assert response.status_code == expected_status
         
-        data = response_data["data"]
-        assert data["status"] == "healthy"
-        assert "timestamp" in data
-        assert "version" in data
-        assert "environment" in data
+        body = response.json()
+        for key, value in expected_values.items():
+            assert body[key] == value
+        assert expected_keys <= body.keys()
     
     def test_readiness_check_endpoint_basic(self, client):
         """Test readiness check endpoint (simplified test)."""
@@ -58,45 +82,16 @@ class TestFastAPIApplication:
         # The response structure may vary, just check it's valid JSON
         assert data is not None
         assert isinstance(data, dict)
-    
-    def test_api_root_endpoint(self, client):
-        """Test API root endpoint."""
-        response = client.get("/api/")
-        assert response.status_code == 200
-        
-        data = response.json()
-        assert data["message"] == "Generic API Framework"
-        assert "version" in data
-        assert "health_url" in data
-    
-    def test_api_v1_root_endpoint(self, client):
-        """Test API v1 root endpoint."""
-        response = client.get("/api/v1/")
-        assert response.status_code == 200
-        
-        data = response.json()
-        assert data["message"] == "API Version 1"
-        assert data["version"] == "1.0"
-    
-    def test_api_v1_status_endpoint(self, client):
-        """Test API v1 status endpoint."""
-        response = client.get("/api/v1/status")
-        assert response.status_code == 200
-        
-        data = response.json()
-        assert data["status"] == "operational"
-        assert data["version"] == "1.0"
-        assert "features" in data
 
 
 class TestApplicationLifespan:
     """Test application lifespan management."""
     
-    def test_lifespan_context_manager(self):
+    def test_lifespan_context_manager(self, app_for):
         """Test lifespan context manager."""
         from src.app import lifespan
         
-        app = create_app("test")
+        app = app_for("test")
         
         # Test that lifespan context manager can be created
         # Note: We can't easily test the actual startup/shutdown without
@@ -110,27 +105,30 @@ class TestApplicationConfiguration:
     
     def test_development_configuration(self):
         """Test development environment configuration."""
-        app = create_app("development")
+        config = _compute_app_config("development")
         
         # Development should have docs enabled
-        assert app.docs_url == "/docs"
-        assert app.redoc_url == "/redoc"
-        assert app.openapi_url == "/openapi.json"
+        assert config["debug"] is True
+        assert config["docs_url"] == "/docs"
+        assert config["redoc_url"] == "/redoc"
+        assert config["openapi_url"] == "/openapi.json"
     
     def test_production_configuration(self):
         """Test production environment configuration."""
-        app = create_app("production")
+        config = _compute_app_config("production")
         
         # Production should have docs disabled
-        assert app.docs_url is None
-        assert app.redoc_url is None
-        assert app.openapi_url is None
+        assert config["debug"] is False
+        assert config["docs_url"] is None
+        assert config["redoc_url"] is None
+        assert config["openapi_url"] is None
     
     def test_test_configuration(self):
         """Test test environment configuration."""
-        app = create_app("test")
+        config = _compute_app_config("test")
         
         # Test should have docs enabled for testing
-        assert app.docs_url == "/docs"
-        assert app.redoc_url == "/redoc"
-        assert app.openapi_url == "/openapi.json"
\ No newline at end of file
+        assert config["debug"] is False
+        assert config["docs_url"] == "/docs"
+        assert config["redoc_url"] == "/redoc"
+        assert config["openapi_url"] == "/openapi.json"
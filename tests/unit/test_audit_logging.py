@@ -2,10 +2,13 @@
 Tests for audit logging system.
 """
 
+import io
 import json
+import logging
 import pytest
-import tempfile
+from dataclasses import dataclass, field
 from datetime import datetime
+from types import SimpleNamespace
 from unittest.mock import Mock, patch, MagicMock
 from pathlib import Path
 
@@ -31,12 +34,72 @@ from src.audit.middleware import (
 )
 
 
+# Keep audit tests on one xdist worker so shared logger state is reused
+pytestmark = pytest.mark.xdist_group(name="audit")
+
+
+# Fields every audit record must carry for compliance
+REQUIRED_COMPLIANCE_FIELDS = frozenset({
+    "event_type", "severity", "message", "timestamp",
+    "user_id", "ip_address", "correlation_id",
+})
+
+# Fixed "now" used for every audit timestamp in this module
+FROZEN_NOW = datetime(2024, 1, 1)
+
+
+class FrozenDateTime(datetime):
+    """datetime whose utcnow() always returns FROZEN_NOW."""
+
+    @classmethod
+    def utcnow(cls):
+        return FROZEN_NOW
+
+
+@pytest.fixture(scope="module", autouse=True)
+def frozen_utcnow():
+    """Freeze datetime.utcnow() in the audit modules for reproducible events."""
+    with patch('src.audit.audit_logger.datetime', FrozenDateTime), \
+         patch('src.audit.decorators.datetime', FrozenDateTime):
+        yield FROZEN_NOW
+
+
+@pytest.fixture(scope="session")
+def audit_log_dir(tmp_path_factory):
+    """Create a directory of reusable audit log files for the session."""
+    return tmp_path_factory.mktemp("audit_logs")
+
+
+@pytest.fixture(scope="class")
+def patched_audit_loggers():
+    """Patch the decorator and middleware audit loggers once per class."""
+    with patch('src.audit.decorators.audit_logger') as decorators_logger, \
+         patch('src.audit.middleware.audit_logger') as middleware_logger:
+        yield decorators_logger, middleware_logger
+
+
+@pytest.fixture
+def mock_audit_logger(patched_audit_loggers):
+    """Provide the patched decorator audit logger with a clean call history."""
+    decorators_logger, _ = patched_audit_loggers
+    decorators_logger.reset_mock()
+    return decorators_logger
+
+
+@pytest.fixture
+def mock_middleware_logger(patched_audit_loggers):
+    """Provide the patched middleware audit logger with a clean call history."""
+    _, middleware_logger = patched_audit_loggers
+    middleware_logger.reset_mock()
+    return middleware_logger
+
+
 class TestAuditEvent:
     """Test AuditEvent data class."""
     
     def test_audit_event_creation(self):
         """Test creating an audit event."""
-        timestamp = datetime.utcnow()
+        timestamp = FROZEN_NOW
         event = AuditEvent(
             event_type=AuditEventType.LOGIN_SUCCESS,
             severity=AuditSeverity.LOW,
@@ -52,10 +115,13 @@ class TestAuditEvent:
         assert event.timestamp == timestamp
         assert event.user_id == "user123"
         assert event.ip_address == "192.168.1.1"
+        
+        # Events are slotted and carry no per-instance __dict__
+        assert not hasattr(event, "__dict__")
     
     def test_audit_event_to_dict(self):
         """Test converting audit event to dictionary."""
-        timestamp = datetime.utcnow()
+        timestamp = FROZEN_NOW
         event = AuditEvent(
             event_type=AuditEventType.LOGIN_SUCCESS,
             severity=AuditSeverity.LOW,
@@ -77,13 +143,28 @@ class TestAuditEvent:
         # Should not include None values
         assert "ip_address" not in event_dict
     
+    def test_audit_event_to_dict_unix_timestamp(self):
+        """Test converting audit event with a Unix timestamp to dictionary."""
+        timestamp = 1640995200.5
+        event = AuditEvent(
+            event_type=AuditEventType.LOGIN_SUCCESS,
+            severity=AuditSeverity.LOW,
+            message="User logged in",
+            timestamp=timestamp,
+        )
+        
+        event_dict = event.to_dict()
+        
+        assert event_dict["timestamp"] == datetime.fromtimestamp(timestamp).isoformat()
+        assert "_iso_timestamp" not in event_dict
+    
     def test_audit_event_to_json(self):
         """Test converting audit event to JSON."""
         event = AuditEvent(
             event_type=AuditEventType.LOGIN_SUCCESS,
             severity=AuditSeverity.LOW,
             message="User logged in",
-            timestamp=datetime.utcnow(),
+            timestamp=FROZEN_NOW,
         )
         
         json_str = event.to_json()
@@ -92,30 +173,78 @@ class TestAuditEvent:
         assert parsed["event_type"] == "auth.login.success"
         assert parsed["severity"] == "low"
         assert parsed["message"] == "User logged in"
+    
+    def test_audit_event_to_json_without_orjson(self):
+        """Test JSON conversion falls back to the standard library encoder."""
+        event = AuditEvent(
+            event_type=AuditEventType.LOGIN_SUCCESS,
+            severity=AuditSeverity.LOW,
+            message="User logged in",
+            timestamp=FROZEN_NOW,
+            metadata={"key": "value"}
+        )
+        
+        with patch('src.audit.audit_logger.orjson', None):
+            parsed = json.loads(event.to_json())
+        
+        assert parsed == event.to_dict()
 
 
 class TestAuditLogger:
     """Test AuditLogger class."""
     
-    @pytest.fixture
-    def temp_log_file(self):
-        """Create temporary log file."""
-        with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.log') as f:
-            yield f.name
-        Path(f.name).unlink(missing_ok=True)
+    @pytest.fixture(scope="class")
+    def temp_log_file(self, audit_log_dir):
+        """Check out the class log file from the session log directory."""
+        return str(audit_log_dir / "test_audit.log")
     
-    def test_audit_logger_initialization(self, temp_log_file):
-        """Test audit logger initialization."""
+    @pytest.fixture(scope="class")
+    def logger(self, temp_log_file):
+        """Create a single audit logger shared by the class."""
         logger = AuditLogger(
             logger_name="test_audit",
             enable_console=False,
             enable_file=True,
             log_file_path=temp_log_file
         )
-        
+        yield logger
+        logger.close()
+    
+    @pytest.fixture(scope="class")
+    def log_buffer(self, logger):
+        """Capture the shared logger's output in memory."""
+        buffer = io.StringIO()
+        handler = logging.StreamHandler(buffer)
+        logger.logger.addHandler(handler)
+        yield buffer
+        logger.logger.removeHandler(handler)
+    
+    @pytest.fixture(autouse=True)
+    def reset_logs(self, temp_log_file, log_buffer):
+        """Start each test with an empty log file and buffer."""
+        Path(temp_log_file).write_text("")
+        log_buffer.seek(0)
+        log_buffer.truncate()
+    
+    def test_audit_logger_initialization(self, logger):
+        """Test audit logger initialization."""
         assert logger.logger.name == "test_audit"
         assert len(logger.logger.handlers) > 0
     
+    def test_audit_logger_does_not_duplicate_handlers(self, logger, temp_log_file):
+        """Test that re-creating a logger for the same file reuses its handler."""
+        handler_count = len(logger.logger.handlers)
+        
+        duplicate = AuditLogger(
+            logger_name="test_audit",
+            enable_console=False,
+            enable_file=True,
+            log_file_path=temp_log_file
+        )
+        
+        assert duplicate.logger is logger.logger
+        assert len(logger.logger.handlers) == handler_count
+    
     def test_audit_logger_creation(self):
         """Test audit logger creation (simplified test)."""
         logger = AuditLogger(
@@ -127,32 +256,20 @@ class TestAuditLogger:
         assert logger is not None
         assert logger.logger is not None
     
-    def test_audit_event_logging_basic(self):
-        """Test basic audit event logging without file I/O."""
-        logger = AuditLogger(
-            logger_name="test_audit",
-            enable_console=True,
-            enable_file=False
-        )
-        
+    def test_audit_event_logging_basic(self, logger):
+        """Test basic audit event logging."""
         event = AuditEvent(
             event_type=AuditEventType.LOGIN_SUCCESS,
             severity=AuditSeverity.LOW,
             message="Test event",
-            timestamp=datetime.utcnow(),
+            timestamp=FROZEN_NOW,
         )
         
         # Test that logging doesn't raise an exception
         logger.log_event(event)
     
-    def test_audit_methods_basic(self):
-        """Test basic audit logging methods without file I/O."""
-        logger = AuditLogger(
-            logger_name="test_audit",
-            enable_console=True,
-            enable_file=False
-        )
-        
+    def test_audit_methods_basic(self, logger, log_buffer):
+        """Test basic audit logging methods."""
         # Test that methods don't raise exceptions
         logger.log_login_success(
             user_id="user123",
@@ -173,7 +290,52 @@ class TestAuditLogger:
             risk_score=80,
             ip_address="192.168.1.1"
         )
+        
+        output = log_buffer.getvalue()
+        assert "User testuser logged in successfully" in output
+        assert "Login failed for user testuser: Invalid password" in output
+        assert "Suspicious activity detected: Multiple failed login attempts" in output
+    
+    def test_flush_writes_buffered_events(self, logger, temp_log_file):
+        """Test that flush writes buffered events to the log file."""
+        logger.log_login_success(
+            user_id="user123",
+            username="testuser",
+            ip_address="192.168.1.1"
+        )
+        
+        logger.flush()
+        
+        content = Path(temp_log_file).read_text()
+        assert "User testuser logged in successfully" in content
+        assert FROZEN_NOW.isoformat() in content
 
+    
+    def test_medium_events_written_without_flush(self, logger, temp_log_file):
+        """Test that MEDIUM events bypass the buffer and reach the file at once."""
+        logger.log_login_failure(
+            username="testuser",
+            reason="Invalid password",
+            ip_address="192.168.1.1"
+        )
+        
+        content = Path(temp_log_file).read_text()
+        assert "Login failed for user testuser: Invalid password" in content
+    
+    def test_close_removes_only_own_handlers(self, logger, audit_log_dir):
+        """Test that closing one logger leaves other instances' handlers alone."""
+        other = AuditLogger(
+            logger_name="test_audit",
+            enable_console=False,
+            enable_file=True,
+            log_file_path=str(audit_log_dir / "other_audit.log")
+        )
+        shared_handlers = [h for h in logger.logger.handlers if h not in other._handlers]
+        
+        other.close()
+        
+        assert logger.logger.handlers == shared_handlers
+        assert other._handlers == []
 
 class TestCorrelationIdManagement:
     """Test correlation ID context management."""
@@ -205,12 +367,6 @@ class TestCorrelationIdManagement:
 class TestAuditDecorators:
     """Test audit decorators."""
     
-    @pytest.fixture
-    def mock_audit_logger(self):
-        """Mock audit logger for testing."""
-        with patch('src.audit.decorators.audit_logger') as mock:
-            yield mock
-    
     def test_audit_event_decorator_sync(self, mock_audit_logger):
         """Test audit event decorator on synchronous function."""
         @audit_event(
@@ -229,6 +385,7 @@ class TestAuditDecorators:
         # Check the logged event
         logged_event = mock_audit_logger.log_event.call_args[0][0]
         assert logged_event.event_type == AuditEventType.USER_CREATED
+        assert logged_event.timestamp == FROZEN_NOW
         assert "testuser created" in logged_event.message
         assert "arguments" in logged_event.metadata
     
@@ -290,12 +447,6 @@ class TestAuditDecorators:
 class TestAuditScope:
     """Test AuditScope context manager."""
     
-    @pytest.fixture
-    def mock_audit_logger(self):
-        """Mock audit logger for testing."""
-        with patch('src.audit.decorators.audit_logger') as mock:
-            yield mock
-    
     def test_audit_scope_success(self, mock_audit_logger):
         """Test audit scope with successful operation."""
         with AuditScope("test_operation", "transaction", "user123"):
@@ -330,26 +481,59 @@ class TestAuditScope:
 class TestSecurityEventDetector:
     """Test SecurityEventDetector class."""
     
-    def test_brute_force_detection(self):
+    def test_brute_force_detection(self, mock_middleware_logger):
         """Test brute force attack detection."""
         detector = SecurityEventDetector()
         
-        with patch('src.audit.middleware.audit_logger') as mock_logger:
-            # Simulate multiple failed login attempts
-            for i in range(6):
-                detector.analyze_login_attempt(
-                    ip_address="192.168.1.100",
-                    username="testuser",
-                    success=False,
-                    timestamp=1640995200 + i  # Sequential timestamps
-                )
-            
-            # Should detect brute force after 5 failures
-            mock_logger.log_suspicious_activity.assert_called()
-            
-            call_args = mock_logger.log_suspicious_activity.call_args
-            assert call_args[1]["activity_type"] == "brute_force"
-            assert call_args[1]["risk_score"] == 80
+        # Simulate multiple failed login attempts
+        for i in range(6):
+            detector.analyze_login_attempt(
+                ip_address="192.168.1.100",
+                username="testuser",
+                success=False,
+                timestamp=1640995200 + i  # Sequential timestamps
+            )
+        
+        # Should detect brute force after 5 failures
+        mock_middleware_logger.log_suspicious_activity.assert_called()
+        
+        call_args = mock_middleware_logger.log_suspicious_activity.call_args
+        assert call_args[1]["activity_type"] == "brute_force"
+        assert call_args[1]["risk_score"] == 80
+    
+    def test_brute_force_detection_batch(self, mock_middleware_logger):
+        """Test brute force detection over a batch of login attempts."""
+        detector = SecurityEventDetector()
+        
+        detector.analyze_login_attempts_batch(
+            [("192.168.1.100", "testuser", False, 1640995200 + i) for i in range(6)]
+            + [("192.168.1.200", "otheruser", False, 1640995200)]
+        )
+        
+        # One event for the brute-forcing IP, none for the single failure
+        mock_middleware_logger.log_suspicious_activity.assert_called_once()
+        
+        call_args = mock_middleware_logger.log_suspicious_activity.call_args
+        assert call_args[1]["activity_type"] == "brute_force"
+        assert call_args[1]["ip_address"] == "192.168.1.100"
+        assert call_args[1]["metadata"]["attempt_count"] == 6
+        assert len(detector.failed_login_attempts["192.168.1.200"]) == 1
+    
+    def test_brute_force_followed_by_success_batch(self, mock_middleware_logger):
+        """Test that a success after a failure burst in one batch is still flagged."""
+        detector = SecurityEventDetector()
+        
+        detector.analyze_login_attempts_batch(
+            [("192.168.1.100", "testuser", False, 1640995200 + i) for i in range(5)]
+            + [("192.168.1.100", "testuser", True, 1640995205)]
+        )
+        
+        mock_middleware_logger.log_suspicious_activity.assert_called_once()
+        
+        call_args = mock_middleware_logger.log_suspicious_activity.call_args
+        assert call_args[1]["ip_address"] == "192.168.1.100"
+        assert call_args[1]["metadata"]["attempt_count"] == 5
+        assert "192.168.1.100" not in detector.failed_login_attempts
     
     def test_successful_login_clears_failures(self):
         """Test that successful login clears failed attempts."""
@@ -373,6 +557,61 @@ class TestSecurityEventDetector:
         )
         
         assert "192.168.1.100" not in detector.failed_login_attempts
+    
+    def test_failed_attempts_expire_and_are_bounded(self, mock_middleware_logger):
+        """Test that old failures expire and tracked failures stay bounded."""
+        detector = SecurityEventDetector()
+        
+        for i in range(detector.max_tracked_attempts + 10):
+            detector.analyze_login_attempt(
+                ip_address="192.168.1.100",
+                username="testuser",
+                success=False,
+                timestamp=1640995200 + i
+            )
+        
+        attempts = detector.failed_login_attempts["192.168.1.100"]
+        assert len(attempts) == detector.max_tracked_attempts
+        
+        # An attempt more than an hour later drops all earlier failures
+        detector.analyze_login_attempt(
+            ip_address="192.168.1.100",
+            username="testuser",
+            success=False,
+            timestamp=1640995200 + 7200
+        )
+        
+        assert list(attempts) == [1640995200 + 7200]
+
+
+@dataclass(slots=True)
+class FakeURL:
+    """Lightweight stand-in for a Starlette URL."""
+    path: str
+
+
+@dataclass(slots=True)
+class FakeClient:
+    """Lightweight stand-in for a Starlette client address."""
+    host: str
+
+
+@dataclass(slots=True)
+class FakeRequest:
+    """Lightweight stand-in for a Starlette request."""
+    url: FakeURL
+    method: str
+    headers: dict
+    query_params: dict
+    client: FakeClient
+    state: SimpleNamespace = field(default_factory=SimpleNamespace)
+
+
+@dataclass(slots=True)
+class FakeResponse:
+    """Lightweight stand-in for a Starlette response."""
+    status_code: int
+    headers: dict = field(default_factory=dict)
 
 
 class TestAuditMiddleware:
@@ -381,29 +620,25 @@ class TestAuditMiddleware:
     @pytest.fixture
     def mock_request(self):
         """Create mock request."""
-        request = Mock()
-        request.url.path = "/api/users"
-        request.method = "GET"
-        request.headers = {
-            "user-agent": "Mozilla/5.0",
-            "x-forwarded-for": "192.168.1.1"
-        }
-        request.query_params = {}
-        request.client.host = "192.168.1.1"
-        request.state = Mock()
-        request.state.user = None
-        return request
+        return FakeRequest(
+            url=FakeURL(path="/api/users"),
+            method="GET",
+            headers={
+                "user-agent": "Mozilla/5.0",
+                "x-forwarded-for": "192.168.1.1"
+            },
+            query_params={},
+            client=FakeClient(host="192.168.1.1"),
+            state=SimpleNamespace(user=None),
+        )
     
     @pytest.fixture
     def mock_response(self):
         """Create mock response."""
-        response = Mock()
-        response.status_code = 200
-        response.headers = {}
-        return response
+        return FakeResponse(status_code=200)
     
     @pytest.mark.asyncio
-    async def test_middleware_request_logging(self, mock_request, mock_response):
+    async def test_middleware_request_logging(self, mock_request, mock_response, mock_middleware_logger):
         """Test middleware request logging."""
         middleware = AuditMiddleware(
             app=Mock(),
@@ -415,16 +650,15 @@ class TestAuditMiddleware:
         async def mock_call_next(request):
             return mock_response
         
-        with patch('src.audit.middleware.audit_logger') as mock_logger:
-            response = await middleware.dispatch(mock_request, mock_call_next)
-            
-            # Should log request and response
-            assert mock_logger.log_event.call_count >= 2
-            assert response.headers["X-Correlation-ID"]
-            assert response.headers["X-Request-ID"]
+        response = await middleware.dispatch(mock_request, mock_call_next)
+        
+        # Should log request and response
+        assert mock_middleware_logger.log_event.call_count >= 2
+        assert response.headers["X-Correlation-ID"]
+        assert response.headers["X-Request-ID"]
     
     @pytest.mark.asyncio
-    async def test_middleware_excluded_paths(self, mock_request, mock_response):
+    async def test_middleware_excluded_paths(self, mock_request, mock_response, mock_middleware_logger):
         """Test middleware excludes certain paths."""
         mock_request.url.path = "/health"
         
@@ -437,14 +671,13 @@ class TestAuditMiddleware:
         async def mock_call_next(request):
             return mock_response
         
-        with patch('src.audit.middleware.audit_logger') as mock_logger:
-            await middleware.dispatch(mock_request, mock_call_next)
-            
-            # Should not log anything for excluded paths
-            mock_logger.log_event.assert_not_called()
+        await middleware.dispatch(mock_request, mock_call_next)
+        
+        # Should not log anything for excluded paths
+        mock_middleware_logger.log_event.assert_not_called()
     
     @pytest.mark.asyncio
-    async def test_middleware_error_handling(self, mock_request):
+    async def test_middleware_error_handling(self, mock_request, mock_middleware_logger):
         """Test middleware error handling."""
         middleware = AuditMiddleware(
             app=Mock(),
@@ -455,23 +688,22 @@ class TestAuditMiddleware:
         async def mock_call_next(request):
             raise ValueError("Test error")
         
-        with patch('src.audit.middleware.audit_logger') as mock_logger:
-            with pytest.raises(ValueError):
-                await middleware.dispatch(mock_request, mock_call_next)
-            
-            # Should log the error
-            mock_logger.log_event.assert_called()
-            
-            # Find the error event
-            error_logged = False
-            for call in mock_logger.log_event.call_args_list:
-                event = call[0][0]
-                if event.event_type == AuditEventType.ERROR_OCCURRED:
-                    error_logged = True
-                    assert "Test error" in event.message
-                    break
-            
-            assert error_logged
+        with pytest.raises(ValueError):
+            await middleware.dispatch(mock_request, mock_call_next)
+        
+        # Should log the error
+        mock_middleware_logger.log_event.assert_called()
+        
+        # Find the error event
+        error_logged = False
+        for call in mock_middleware_logger.log_event.call_args_list:
+            event = call[0][0]
+            if event.event_type == AuditEventType.ERROR_OCCURRED:
+                error_logged = True
+                assert "Test error" in event.message
+                break
+        
+        assert error_logged
 
 
 class TestAuditIntegration:
@@ -491,7 +723,7 @@ class TestAuditIntegration:
             event_type=AuditEventType.LOGIN_SUCCESS,
             severity=AuditSeverity.LOW,
             message="User logged in",
-            timestamp=datetime.utcnow(),
+            timestamp=FROZEN_NOW,
             user_id="user123",
             ip_address="192.168.1.1",
             correlation_id="corr-123"
@@ -499,12 +731,6 @@ class TestAuditIntegration:
         
         event_dict = event.to_dict()
         
-        # Check required compliance fields
-        required_fields = [
-            "event_type", "severity", "message", "timestamp",
-            "user_id", "ip_address", "correlation_id"
-        ]
-        
-        for field in required_fields:
-            assert field in event_dict
-            assert event_dict[field] is not None
\ No newline at end of file
+        # Check required compliance fields (to_dict drops None values)
+        missing = REQUIRED_COMPLIANCE_FIELDS - event_dict.keys()
+        assert not missing, missing
\ No newline at end of file
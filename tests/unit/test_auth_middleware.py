@@ -5,19 +5,20 @@ This module tests the authentication middleware and backends including
 JWT, API key, and OAuth2 authentication.
 """
 
-import os
+import asyncio
+import time
+import uuid
 import pytest
 from datetime import datetime, timedelta
-from unittest.mock import Mock, patch
+from dataclasses import dataclass, field
+from unittest.mock import patch
 from fastapi import FastAPI, Request
-from fastapi.testclient import TestClient
+from fastapi.security import HTTPAuthorizationCredentials
+import httpx
 import jwt
 
-# Skip configuration validation and initialization for tests
-os.environ["SKIP_CONFIG_VALIDATION"] = "1"
-os.environ["SKIP_CONFIG_INIT"] = "1"
-
 from src.middleware.auth import (
+    AuthenticationBackend,
     JWTAuthenticationBackend,
     APIKeyAuthenticationBackend,
     OAuth2AuthenticationBackend,
@@ -27,21 +28,82 @@ from src.middleware.auth import (
     create_oauth2_backend,
     verify_password,
     get_password_hash,
+    hash_password_async,
+    verify_password_async,
 )
 
 
+@dataclass(slots=True)
+class _Req:
+    """Minimal request stand-in exposing what the backends read."""
+    headers: dict = field(default_factory=dict)
+    query_params: dict = field(default_factory=dict)
+
+
+def _fake_bearer(token):
+    """Build an async stand-in for HTTPBearer that yields the given token."""
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+    
+    async def bearer(request):
+        return credentials
+    
+    return bearer
+
+
+class _StaticBackend(AuthenticationBackend):
+    """Backend returning a fixed result after an optional delay or gate."""
+    
+    def __init__(self, name, result=None, delay=0.0, error=None,
+                 network_bound=False, gate=None, started=None):
+        self.name = name
+        self.result = result
+        self.delay = delay
+        self.error = error
+        self.network_bound = network_bound
+        self.gate = gate
+        self.started = started
+        self.calls = 0
+    
+    async def authenticate(self, request):
+        self.calls += 1
+        if self.started is not None:
+            self.started.set()
+        if self.gate is not None:
+            await self.gate.wait()
+        await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return self.result
+    
+    def get_scheme_name(self):
+        return self.name
+
+
+@pytest.fixture(scope="module")
+def jwt_backend():
+    """JWT backend shared by the token tests in this module."""
+    return JWTAuthenticationBackend(
+        secret_key="test-secret",
+        algorithm="HS256",
+        auto_error=False
+    )
+
+
 class TestJWTAuthenticationBackend:
     """Test JWT authentication backend."""
     
-    def test_create_access_token(self):
+    @pytest.fixture(autouse=True)
+    def reset_jwt_backend(self, jwt_backend):
+        """Restore the shared backend's bearer and drop cached payloads."""
+        bearer = jwt_backend.bearer
+        yield
+        jwt_backend.bearer = bearer
+        jwt_backend._payload_cache.clear()
+    
+    def test_create_access_token(self, jwt_backend):
         """Test JWT access token creation."""
-        backend = JWTAuthenticationBackend(
-            secret_key="test-secret",
-            algorithm="HS256"
-        )
-        
         data = {"sub": "user123", "username": "testuser"}
-        token = backend.create_access_token(data)
+        token = jwt_backend.create_access_token(data)
         
         # Verify token can be decoded
         payload = jwt.decode(token, "test-secret", algorithms=["HS256"])
@@ -51,15 +113,10 @@ class TestJWTAuthenticationBackend:
         assert "exp" in payload
         assert "iat" in payload
     
-    def test_create_refresh_token(self):
+    def test_create_refresh_token(self, jwt_backend):
         """Test JWT refresh token creation."""
-        backend = JWTAuthenticationBackend(
-            secret_key="test-secret",
-            algorithm="HS256"
-        )
-        
         data = {"sub": "user123", "username": "testuser"}
-        token = backend.create_refresh_token(data)
+        token = jwt_backend.create_refresh_token(data)
         
         # Verify token can be decoded
         payload = jwt.decode(token, "test-secret", algorithms=["HS256"])
@@ -69,92 +126,158 @@ class TestJWTAuthenticationBackend:
         assert "exp" in payload
         assert "iat" in payload
     
-    def test_custom_expiration(self):
+    def test_custom_expiration(self, jwt_backend):
         """Test custom token expiration."""
-        backend = JWTAuthenticationBackend(
-            secret_key="test-secret",
-            algorithm="HS256"
-        )
-        
         data = {"sub": "user123"}
         expires_delta = timedelta(minutes=5)
-        token = backend.create_access_token(data, expires_delta)
+        token = jwt_backend.create_access_token(data, expires_delta)
         
         payload = jwt.decode(token, "test-secret", algorithms=["HS256"])
-        exp_time = datetime.utcfromtimestamp(payload["exp"])
-        iat_time = datetime.utcfromtimestamp(payload["iat"])
         
-        # Should expire in approximately 5 minutes
-        time_diff = exp_time - iat_time
-        assert 290 <= time_diff.total_seconds() <= 310  # Allow some variance
+        # iat and exp are integer seconds from a single clock read
+        assert payload["exp"] - payload["iat"] == 300
     
-    def test_token_creation_basic(self):
-        """Test basic JWT token creation (simplified test)."""
+    def test_token_roundtrip_without_orjson(self, jwt_backend):
+        """Test token creation and decoding with the stdlib JSON fallback."""
+        with patch("src.middleware.auth.orjson", None):
+            token = jwt_backend.create_access_token({"sub": "user123", "roles": ["admin"]})
+            payload = jwt_backend._verify_token(token)
+        
+        assert payload == jwt.decode(token, "test-secret", algorithms=["HS256"])
+        assert payload["roles"] == ["admin"]
+        assert isinstance(payload["exp"], int)
+    
+    @pytest.mark.parametrize("use_orjson", [True, False], ids=["orjson", "stdlib"])
+    def test_custom_claims_encode_like_pyjwt(self, jwt_backend, use_orjson):
+        """Test that custom claims encode the same with or without orjson."""
+        import src.middleware.auth as auth_module
+        orjson_module = auth_module.orjson if use_orjson else None
+        
+        with patch("src.middleware.auth.orjson", orjson_module):
+            token = jwt_backend.create_access_token({"sub": "user123", "scores": {1: "a"}})
+            with pytest.raises(TypeError):
+                jwt_backend.create_access_token({"sub": "user123", "seen": datetime.now()})
+            with pytest.raises(TypeError):
+                jwt_backend.create_access_token({"sub": "user123", "ref": uuid.uuid4()})
+        
+        assert jwt.decode(token, "test-secret", algorithms=["HS256"])["scores"] == {"1": "a"}
+    
+    def test_hmac_rejects_asymmetric_looking_secret(self):
+        """Test that PyJWT's guard against PEM keys as HMAC secrets still applies."""
         backend = JWTAuthenticationBackend(
-            secret_key="test-secret",
+            secret_key="-----BEGIN PUBLIC KEY-----\nabc\n-----END PUBLIC KEY-----",
             algorithm="HS256",
             auto_error=False
         )
         
+        with pytest.raises(jwt.InvalidKeyError):
+            backend.create_access_token({"sub": "user123"})
+    
+    def test_hmac_signing_matches_pyjwt(self, jwt_backend):
+        """Test that the pre-encoded header path produces standard tokens."""
+        token = jwt_backend.create_access_token({"sub": "user123"})
+        payload = jwt.decode(token, "test-secret", algorithms=["HS256"])
+        
+        assert token == jwt.encode(payload, "test-secret", algorithm="HS256")
+        assert jwt.get_unverified_header(token) == {"alg": "HS256", "typ": "JWT"}
+    
+    def test_token_creation_basic(self, jwt_backend):
+        """Test basic JWT token creation (simplified test)."""
         # Test that token creation works
         data = {"sub": "user123", "username": "testuser"}
-        token = backend.create_access_token(data)
+        token = jwt_backend.create_access_token(data)
         
         assert isinstance(token, str)
         assert len(token) > 0
     
     @pytest.mark.asyncio
-    async def test_expired_token_authentication(self):
+    async def test_expired_token_authentication(self, jwt_backend):
         """Test authentication with expired JWT token."""
-        backend = JWTAuthenticationBackend(
-            secret_key="test-secret",
-            algorithm="HS256",
-            auto_error=False
-        )
-        
         # Create an expired token
         data = {"sub": "user123", "username": "testuser"}
         expires_delta = timedelta(seconds=-1)  # Already expired
-        token = backend.create_access_token(data, expires_delta)
-        
-        # Mock request with Authorization header
-        request = Mock()
-        request.headers = {"authorization": f"Bearer {token}"}
-        
-        # Mock HTTPBearer to return credentials
-        with patch.object(backend.bearer, '__call__') as mock_bearer:
-            from fastapi.security import HTTPAuthorizationCredentials
-            mock_bearer.return_value = HTTPAuthorizationCredentials(
-                scheme="Bearer",
-                credentials=token
-            )
-            
-            user_info = await backend.authenticate(request)
-            assert user_info is None
+        token = jwt_backend.create_access_token(data, expires_delta)
+        
+        # Stub request with Authorization header
+        request = _Req(headers={"authorization": f"Bearer {token}"})
+        
+        # Stub HTTPBearer to return credentials
+        jwt_backend.bearer = _fake_bearer(token)
+        
+        user_info = await jwt_backend.authenticate(request)
+        assert user_info is None
     
     @pytest.mark.asyncio
-    async def test_invalid_token_authentication(self):
+    async def test_invalid_token_authentication(self, jwt_backend):
         """Test authentication with invalid JWT token."""
-        backend = JWTAuthenticationBackend(
-            secret_key="test-secret",
-            algorithm="HS256",
-            auto_error=False
-        )
+        # Stub request with invalid token
+        request = _Req(headers={"authorization": "Bearer invalid-token"})
         
-        # Mock request with invalid token
-        request = Mock()
-        request.headers = {"authorization": "Bearer invalid-token"}
-        
-        # Mock HTTPBearer to return credentials
-        with patch.object(backend.bearer, '__call__') as mock_bearer:
-            from fastapi.security import HTTPAuthorizationCredentials
-            mock_bearer.return_value = HTTPAuthorizationCredentials(
-                scheme="Bearer",
-                credentials="invalid-token"
-            )
-            
-            user_info = await backend.authenticate(request)
-            assert user_info is None
+        # Stub HTTPBearer to return credentials
+        jwt_backend.bearer = _fake_bearer("invalid-token")
+        
+        user_info = await jwt_backend.authenticate(request)
+        assert user_info is None
+    
+    @pytest.mark.asyncio
+    async def test_malformed_token_rejected_before_decode(self, jwt_backend):
+        """Test that tokens without three segments never reach the decoder."""
+        jwt_backend.bearer = _fake_bearer("invalid-token")
+        
+        with patch.object(jwt_backend, "_verify_token") as mock_decode:
+            user_info = await jwt_backend.authenticate(_Req())
+        
+        assert user_info is None
+        mock_decode.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_cached_token_skips_decode(self, jwt_backend):
+        """Test that a verified token is served from cache on reuse."""
+        token = jwt_backend.create_access_token({"sub": "user123", "username": "testuser"})
+        jwt_backend.bearer = _fake_bearer(token)
+        request = _Req()
+        
+        with patch.object(jwt_backend, "_verify_token", wraps=jwt_backend._verify_token) as mock_decode:
+            first = await jwt_backend.authenticate(request)
+            second = await jwt_backend.authenticate(request)
+        
+        assert first["user_id"] == "user123"
+        assert second == first
+        assert mock_decode.call_count == 1
+    
+    @pytest.mark.asyncio
+    async def test_cached_payload_not_shared_with_callers(self, jwt_backend):
+        """Test that mutating returned roles does not leak into the cache."""
+        token = jwt_backend.create_access_token({"sub": "user123", "roles": ["user"]})
+        jwt_backend.bearer = _fake_bearer(token)
+        
+        first = await jwt_backend.authenticate(_Req())
+        first["roles"].append("admin")
+        first["permissions"].append("*")
+        second = await jwt_backend.authenticate(_Req())
+        
+        assert second["roles"] == ["user"]
+        assert second["permissions"] == []
+    
+    @pytest.mark.parametrize(
+        "claims,error",
+        [
+            ({"aud": "other-service"}, jwt.InvalidAudienceError),
+            ({"iat": int(time.time()) + 3600}, jwt.ImmatureSignatureError),
+            ({"sub": 123}, jwt.exceptions.InvalidSubjectError),
+            ({"iat": "yesterday"}, jwt.InvalidIssuedAtError),
+        ],
+        ids=["foreign_aud", "future_iat", "non_string_sub", "non_numeric_iat"],
+    )
+    def test_invalid_claims_rejected(self, jwt_backend, claims, error):
+        """Test that registered-claim violations are rejected and not cached."""
+        payload = {"sub": "user123", "exp": int(time.time()) + 300, **claims}
+        token = jwt.encode(payload, "test-secret", algorithm="HS256")
+        
+        with pytest.raises(error):
+            jwt_backend._decode_token(token)
+        
+        assert not jwt_backend._payload_cache
 
 
 class TestAPIKeyAuthenticationBackend:
@@ -176,10 +299,8 @@ class TestAPIKeyAuthenticationBackend:
             auto_error=False
         )
         
-        # Mock request with API key header
-        request = Mock()
-        request.headers = {"X-API-Key": "test-api-key"}
-        request.query_params = {}
+        # Stub request with API key header
+        request = _Req(headers={"X-API-Key": "test-api-key"})
         
         user_info = await backend.authenticate(request)
         
@@ -206,10 +327,8 @@ class TestAPIKeyAuthenticationBackend:
             auto_error=False
         )
         
-        # Mock request with API key in query params
-        request = Mock()
-        request.headers = {}
-        request.query_params = {"api_key": "test-api-key"}
+        # Stub request with API key in query params
+        request = _Req(query_params={"api_key": "test-api-key"})
         
         user_info = await backend.authenticate(request)
         
@@ -228,10 +347,8 @@ class TestAPIKeyAuthenticationBackend:
             auto_error=False
         )
         
-        # Mock request with invalid API key
-        request = Mock()
-        request.headers = {"X-API-Key": "invalid-key"}
-        request.query_params = {}
+        # Stub request with invalid API key
+        request = _Req(headers={"X-API-Key": "invalid-key"})
         
         user_info = await backend.authenticate(request)
         assert user_info is None
@@ -244,10 +361,8 @@ class TestAPIKeyAuthenticationBackend:
             auto_error=False
         )
         
-        # Mock request without API key
-        request = Mock()
-        request.headers = {}
-        request.query_params = {}
+        # Stub request without API key
+        request = _Req()
         
         user_info = await backend.authenticate(request)
         assert user_info is None
@@ -261,22 +376,16 @@ class TestOAuth2AuthenticationBackend:
         """Test authentication with valid OAuth2 token."""
         backend = OAuth2AuthenticationBackend(auto_error=False)
         
-        # Mock request with OAuth2 token
-        request = Mock()
-        request.headers = {"authorization": "Bearer oauth2_valid_token"}
+        # Stub request with OAuth2 token
+        request = _Req(headers={"authorization": "Bearer oauth2_valid_token"})
         
-        # Mock HTTPBearer to return credentials
-        with patch.object(backend.bearer, '__call__') as mock_bearer:
-            from fastapi.security import HTTPAuthorizationCredentials
-            
-            # Make the mock async
-            async def async_mock(*args, **kwargs):
-                return HTTPAuthorizationCredentials(
-                    scheme="Bearer",
-                    credentials="oauth2_valid_token"
-                )
-            mock_bearer.side_effect = async_mock
-            
+        # Stub HTTPBearer to return credentials
+        backend.bearer = _fake_bearer("oauth2_valid_token")
+        
+        user_info = await backend.authenticate(request)
+        assert user_info is not None
+        assert user_info["auth_method"] == "oauth2"
+    
     def test_oauth2_backend_creation(self):
         """Test OAuth2 backend creation (simplified test)."""
         backend = OAuth2AuthenticationBackend(auto_error=False)
@@ -287,7 +396,8 @@ class TestOAuth2AuthenticationBackend:
 class TestAuthenticationMiddleware:
     """Test authentication middleware."""
     
-    def test_exempt_paths(self):
+    @pytest.mark.asyncio
+    async def test_exempt_paths(self):
         """Test that exempt paths don't require authentication."""
         backends = [create_jwt_backend()]
         
@@ -307,14 +417,95 @@ class TestAuthenticationMiddleware:
         async def health_endpoint():
             return {"message": "health"}
         
-        client = TestClient(app)
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            # Exempt paths should work without authentication
+            response = await client.get("/docs")
+            assert response.status_code == 200
+            
+            response = await client.get("/health")
+            assert response.status_code == 200
+    
+    def test_exempt_path_matching(self):
+        """Test exact, prefix and wildcard exempt path matching."""
+        middleware = AuthenticationMiddleware(
+            FastAPI(),
+            backends=[],
+            exempt_paths=["/docs", "/static/*"]
+        )
         
-        # Exempt paths should work without authentication
-        response = client.get("/docs")
-        assert response.status_code == 200
+        assert middleware._is_exempt_path("/docs") is True
+        assert middleware._is_exempt_path("/docs/oauth2-redirect") is True
+        assert middleware._is_exempt_path("/static/app.js") is True
+        assert middleware._is_exempt_path("/api/v1/users") is False
+    
+    @pytest.mark.asyncio
+    async def test_network_backends_run_concurrently(self):
+        """Test that network-bound backends overlap instead of running in turn."""
+        second_started = asyncio.Event()
+        # The first backend can only finish once the second has started
+        first = _StaticBackend("First", network_bound=True, gate=second_started)
+        second = _StaticBackend(
+            "Second", result={"username": "second"}, network_bound=True, started=second_started
+        )
+        middleware = AuthenticationMiddleware(FastAPI(), backends=[first, second])
         
-        response = client.get("/health")
-        assert response.status_code == 200
+        user_info, backend = await asyncio.wait_for(middleware._authenticate(_Req()), timeout=5)
+        
+        assert user_info == {"username": "second"}
+        assert backend is second
+    
+    @pytest.mark.asyncio
+    async def test_configured_order_takes_precedence(self):
+        """Test that an earlier backend wins even when a later one finishes first."""
+        slow = _StaticBackend("Slow", result={"username": "slow"}, delay=0.01, network_bound=True)
+        fast = _StaticBackend("Fast", result={"username": "fast"}, network_bound=True)
+        local = _StaticBackend("Local", result={"username": "local"})
+        middleware = AuthenticationMiddleware(FastAPI(), backends=[slow, fast, local])
+        
+        user_info, backend = await middleware._authenticate(_Req())
+        
+        assert user_info == {"username": "slow"}
+        assert backend is slow
+    
+    @pytest.mark.asyncio
+    async def test_network_backend_skipped_after_local_decision(self):
+        """Test that later network backends never start once a local backend decides."""
+        from fastapi import HTTPException
+        
+        local = _StaticBackend("Local", result={"username": "local"})
+        remote = _StaticBackend("Remote", result={"username": "remote"}, network_bound=True)
+        middleware = AuthenticationMiddleware(FastAPI(), backends=[local, remote])
+        
+        assert await middleware._authenticate(_Req()) == ({"username": "local"}, local)
+        
+        # A local rejection stops the request just like a success would
+        middleware.backends = [
+            _StaticBackend("Rejecting", error=HTTPException(status_code=401, detail="local")),
+            remote,
+        ]
+        with pytest.raises(HTTPException) as exc_info:
+            await middleware._authenticate(_Req())
+        assert exc_info.value.detail == "local"
+        assert remote.calls == 0
+    
+    @pytest.mark.asyncio
+    async def test_earliest_backend_rejection_raised(self):
+        """Test that the earliest backend's rejection wins over later outcomes."""
+        from fastapi import HTTPException
+        
+        first = _StaticBackend(
+            "First", error=HTTPException(status_code=401, detail="first"), delay=0.01, network_bound=True
+        )
+        second = _StaticBackend("Second", result={"username": "second"}, network_bound=True)
+        middleware = AuthenticationMiddleware(FastAPI(), backends=[first, second])
+        
+        with pytest.raises(HTTPException) as exc_info:
+            await middleware._authenticate(_Req())
+        assert exc_info.value.detail == "first"
+        
+        middleware.backends = [_StaticBackend("None"), _StaticBackend("Broken", error=RuntimeError())]
+        assert await middleware._authenticate(_Req()) == (None, None)
     
     def test_middleware_creation(self):
         """Test that authentication middleware can be created (simplified test)."""
@@ -372,6 +563,35 @@ class TestPasswordUtilities:
         # But both should verify correctly
         assert verify_password(password, hash1) is True
         assert verify_password(password, hash2) is True
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_hashing(self):
+        """Test hashing several passwords concurrently off the event loop."""
+        passwords = [f"password_{i}" for i in range(8)]
+        
+        hashes = await asyncio.gather(*(hash_password_async(p) for p in passwords))
+        
+        assert len(set(hashes)) == len(passwords)
+        results = await asyncio.gather(
+            *(verify_password_async(p, h) for p, h in zip(passwords, hashes))
+        )
+        assert all(results)
+        assert await verify_password_async("wrong_password", hashes[0]) is False
+    
+    @pytest.mark.asyncio
+    async def test_login_verifies_password_off_event_loop(self):
+        """Test that the login route checks passwords through the async helper."""
+        from src.routes.v1 import auth as auth_routes
+        
+        with patch.object(
+            auth_routes, "verify_password_async", wraps=verify_password_async
+        ) as async_verify:
+            user = await auth_routes.authenticate_user("testuser", "testpass123")
+            rejected = await auth_routes.authenticate_user("testuser", "wrong")
+        
+        assert user["username"] == "testuser"
+        assert rejected is None
+        assert async_verify.await_count == 2
 
 
 class TestBackendFactories:
@@ -383,6 +603,14 @@ class TestBackendFactories:
         assert isinstance(backend, JWTAuthenticationBackend)
         assert backend.get_scheme_name() == "JWT"
     
+    def test_default_algorithm_is_hs256(self):
+        """Test that the JWT factory signs with HS256 by default."""
+        backend = create_jwt_backend()
+        assert backend.algorithm == "HS256"
+        
+        token = backend.create_access_token({"sub": "user123"})
+        assert jwt.get_unverified_header(token)["alg"] == "HS256"
+    
     def test_create_api_key_backend(self):
         """Test API key backend factory."""
         backend = create_api_key_backend()
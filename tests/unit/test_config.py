@@ -3,14 +3,10 @@ Tests for configuration management system.
 """
 
 import os
+import sys
 import pytest
 from unittest.mock import patch, MagicMock
 
-# Set test environment before importing config
-os.environ["API_ENV"] = "test"
-os.environ["SKIP_CONFIG_INIT"] = "1"
-os.environ["SKIP_CONFIG_VALIDATION"] = "1"
-
 from src.config import (
     settings,
     ConfigurationError,
@@ -24,6 +20,7 @@ from src.config import (
     get_logging_config,
     get_jwt_config,
     get_feature_flags,
+    reload_config,
 )
 from src.config.environment import (
     Environment,
@@ -35,20 +32,19 @@ from src.config.environment import (
 class TestEnvironmentDetector:
     """Test environment detection functionality."""
     
-    def test_detect_environment_from_api_env(self):
+    def test_detect_environment_from_api_env(self, monkeypatch):
         """Test environment detection from API_ENV variable."""
-        with patch.dict(os.environ, {"API_ENV": "production"}):
-            env = EnvironmentDetector.detect_environment()
-            assert env == Environment.PRODUCTION
+        monkeypatch.setenv("API_ENV", "production")
+        env = EnvironmentDetector.detect_environment()
+        assert env == Environment.PRODUCTION
     
-    def test_detect_environment_from_env(self):
+    def test_detect_environment_from_env(self, monkeypatch):
         """Test environment detection from ENV variable."""
-        with patch.dict(os.environ, {"ENV": "staging"}, clear=False):
-            # Clear API_ENV to test fallback
-            if "API_ENV" in os.environ:
-                del os.environ["API_ENV"]
-            env = EnvironmentDetector.detect_environment()
-            assert env == Environment.STAGING
+        # Clear API_ENV to test fallback
+        monkeypatch.delenv("API_ENV", raising=False)
+        monkeypatch.setenv("ENV", "staging")
+        env = EnvironmentDetector.detect_environment()
+        assert env == Environment.STAGING
     
     def test_detect_environment_pytest(self):
         """Test environment detection when running in pytest."""
@@ -56,12 +52,22 @@ class TestEnvironmentDetector:
         env = EnvironmentDetector.detect_environment()
         assert env == Environment.TEST
     
-    def test_detect_environment_default(self):
+    def test_detect_environment_default(self, monkeypatch):
         """Test default environment detection."""
-        with patch.dict(os.environ, {}, clear=True):
-            with patch("sys.modules", {}):
-                env = EnvironmentDetector.detect_environment()
-                assert env == Environment.DEVELOPMENT
+        for var in ("API_ENV", "ENV", "ENVIRONMENT", "PYTEST_CURRENT_TEST"):
+            monkeypatch.delenv(var, raising=False)
+        monkeypatch.delitem(sys.modules, "pytest")
+        env = EnvironmentDetector.detect_environment()
+        assert env == Environment.DEVELOPMENT
+    
+    def test_detect_environment_tracks_changes(self, monkeypatch):
+        """Test that memoized detection still follows environment changes."""
+        EnvironmentDetector.cache_clear()
+        monkeypatch.setenv("API_ENV", "staging")
+        assert EnvironmentDetector.detect_environment() == Environment.STAGING
+        assert EnvironmentDetector.detect_environment() == Environment.STAGING
+        monkeypatch.setenv("API_ENV", "production")
+        assert EnvironmentDetector.detect_environment() == Environment.PRODUCTION
     
     def test_environment_helper_methods(self):
         """Test environment helper methods."""
@@ -166,6 +172,19 @@ class TestConfigurationSettings:
         assert "access_token_expire_minutes" in jwt_config
         assert "refresh_token_expire_days" in jwt_config
     
+    def test_get_jwt_config_missing_secret_key(self):
+        """Test that a missing secret key raises instead of being cached as None."""
+        reload_config()
+        try:
+            with patch("src.config.settings.settings") as mock_settings:
+                mock_settings.as_dict.return_value = {}
+                with pytest.raises(ConfigurationError):
+                    get_jwt_config()
+        finally:
+            reload_config()
+        
+        assert get_jwt_config()["secret_key"]
+    
     def test_get_feature_flags(self):
         """Test feature flags retrieval."""
         feature_flags = get_feature_flags()
@@ -174,6 +193,29 @@ class TestConfigurationSettings:
         assert "registration_enabled" in feature_flags
         assert "email_verification" in feature_flags
         assert "social_login" in feature_flags
+    
+    def test_cached_config_is_not_shared(self):
+        """Test that mutating a returned config does not leak into later calls."""
+        cors_config = get_cors_config()
+        cors_config["allow_origins"].append("http://evil.example.com")
+        cors_config["allow_credentials"] = "mutated"
+        
+        fresh = get_cors_config()
+        assert "http://evil.example.com" not in fresh["allow_origins"]
+        assert fresh["allow_credentials"] != "mutated"
+    
+    def test_reload_config(self):
+        """Test that cached getters are refreshed by reload_config."""
+        assert get_jwt_config() == get_jwt_config()
+        
+        original = settings.access_token_expire_minutes
+        try:
+            settings.access_token_expire_minutes = original + 1
+            reload_config()
+            assert get_jwt_config()["access_token_expire_minutes"] == original + 1
+        finally:
+            settings.access_token_expire_minutes = original
+            reload_config()
 
 
 class TestConfigurationValidation:
@@ -200,6 +242,24 @@ class TestConfigurationValidation:
         # The validation logic is tested in integration tests
         pass
     
+    def test_config_schema_constraints(self):
+        """Test the schema enforces the custom checks and adds no new ones."""
+        from pydantic import ValidationError
+        from src.config.settings import ConfigSchema
+        
+        valid = {"cors_origins": ["http://localhost:3000"]}
+        assert ConfigSchema.model_validate(valid).cors_origins == ["http://localhost:3000"]
+        
+        # Key length and algorithm are left to the Dynaconf validators
+        ConfigSchema.model_validate({**valid, "secret_key": "short", "algorithm": "none"})
+        
+        with pytest.raises(ValidationError):
+            ConfigSchema.model_validate({**valid, "cors_origins": [123]})
+        with pytest.raises(ValidationError):
+            ConfigSchema.model_validate({**valid, "database_url": 123})
+        with pytest.raises(ValidationError):
+            ConfigSchema.model_validate({})
+    
     def test_configuration_error_exception(self):
         """Test ConfigurationError exception."""
         error = ConfigurationError("Test error message")
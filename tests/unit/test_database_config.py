@@ -3,8 +3,10 @@ Tests for database configuration and connection management.
 """
 
 import pytest
+import pytest_asyncio
 import asyncio
-from unittest.mock import Mock, patch, AsyncMock
+from unittest.mock import patch, AsyncMock
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
 
 from src.database.config import (
@@ -17,6 +19,58 @@ from src.database.config import (
     check_database_health,
     get_database_info,
 )
+from tests.test_config import TEST_DATABASE_URL
+
+
+# Smoke-test statement shared by the session tests
+_SELECT_ONE = text("SELECT 1")
+
+
+# Keep the module-scoped engine and database users on one xdist worker
+pytestmark = pytest.mark.xdist_group(name="database_config")
+
+
+class _FakeResult:
+    """Query result stand-in for health checks."""
+    
+    def scalar(self):
+        return 1
+
+
+class _FakeSession:
+    """Session context manager stand-in whose queries succeed."""
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        return False
+    
+    async def execute(self, query):
+        return _FakeResult()
+
+
+class _FailingSession(_FakeSession):
+    """Session context manager stand-in that cannot connect."""
+    
+    async def __aenter__(self):
+        raise Exception("Connection failed")
+
+
+@pytest_asyncio.fixture(scope="module")
+async def sqlite_engine():
+    """SQLite engine shared by the tests that only inspect engine setup."""
+    engine = create_engine(TEST_DATABASE_URL)
+    yield engine
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture(scope="module")
+async def initialized_database():
+    """Initialize the global test database once for the tests that use it."""
+    await init_database(TEST_DATABASE_URL, create_tables=True)
+    yield
+    await close_database()
 
 
 class TestDatabaseConfig:
@@ -28,16 +82,15 @@ class TestDatabaseConfig:
         assert isinstance(url, str)
         assert url  # Should not be empty
     
-    def test_create_engine_default_params(self):
+    def test_create_engine_default_params(self, sqlite_engine):
         """Test creating engine with default parameters."""
-        engine = create_engine("sqlite+aiosqlite:///./test.db")
-        assert isinstance(engine, AsyncEngine)
-        assert engine.url.database == "./test.db"
+        assert isinstance(sqlite_engine, AsyncEngine)
+        assert sqlite_engine.url.database == ":memory:"
     
     def test_create_engine_custom_params(self):
         """Test creating engine with custom parameters."""
         engine = create_engine(
-            "sqlite+aiosqlite:///./test.db",
+            TEST_DATABASE_URL,
             echo=True,
             pool_size=10,
             max_overflow=20
@@ -45,10 +98,9 @@ class TestDatabaseConfig:
         assert isinstance(engine, AsyncEngine)
         assert engine.echo is True
     
-    def test_create_session_factory(self):
+    def test_create_session_factory(self, sqlite_engine):
         """Test creating session factory."""
-        engine = create_engine("sqlite+aiosqlite:///./test.db")
-        factory = create_session_factory(engine)
+        factory = create_session_factory(sqlite_engine)
         assert factory is not None
         # Test that we can create a session
         session = factory()
@@ -59,7 +111,7 @@ class TestDatabaseConfig:
         """Test database initialization."""
         with patch('src.database.config._engine', None):
             with patch('src.database.config._session_factory', None):
-                await init_database("sqlite+aiosqlite:///./test.db", create_tables=False)
+                await init_database(TEST_DATABASE_URL, create_tables=False)
                 # Should not raise any exceptions
     
     @pytest.mark.asyncio
@@ -70,53 +122,38 @@ class TestDatabaseConfig:
         mock_engine.dispose = AsyncMock()
         
         with patch('src.database.config._engine', mock_engine):
-            await close_database()
-            mock_engine.dispose.assert_called_once()
+            with patch('src.database.config._session_factory', None):
+                await close_database()
+                mock_engine.dispose.assert_called_once()
     
     @pytest.mark.asyncio
-    async def test_get_session_context_manager(self):
+    async def test_get_session_context_manager(self, initialized_database):
         """Test session context manager."""
-        # Initialize database first
-        await init_database("sqlite+aiosqlite:///./test.db", create_tables=False)
-        
         async with get_session() as session:
             assert isinstance(session, AsyncSession)
     
     @pytest.mark.asyncio
     async def test_check_database_health_success(self):
         """Test successful database health check."""
-        # Mock session that executes successfully
-        mock_session = AsyncMock()
-        mock_result = Mock()
-        mock_result.scalar.return_value = 1
-        mock_session.execute.return_value = mock_result
-        
-        with patch('src.database.config.get_session') as mock_get_session:
-            mock_get_session.return_value.__aenter__.return_value = mock_session
-            
+        with patch('src.database.config.get_session', _FakeSession):
             result = await check_database_health()
-            
-            assert result["status"] == "healthy"
-            assert result["database"] == "connected"
+        
+        assert result["status"] == "healthy"
+        assert result["database"] == "connected"
     
     @pytest.mark.asyncio
     async def test_check_database_health_failure(self):
         """Test failed database health check."""
-        with patch('src.database.config.get_session') as mock_get_session:
-            mock_get_session.side_effect = Exception("Connection failed")
-            
+        with patch('src.database.config.get_session', _FailingSession):
             result = await check_database_health()
-            
-            assert result["status"] == "unhealthy"
-            assert result["database"] == "disconnected"
-            assert "error" in result
+        
+        assert result["status"] == "unhealthy"
+        assert result["database"] == "disconnected"
+        assert result["error"] == "Connection failed"
     
     @pytest.mark.asyncio
-    async def test_get_database_info(self):
+    async def test_get_database_info(self, initialized_database):
         """Test getting database information."""
-        # Initialize database first
-        await init_database("sqlite+aiosqlite:///./test.db", create_tables=False)
-        
         info = await get_database_info()
         
         assert "url" in info
@@ -128,10 +165,9 @@ class TestDatabaseConfig:
 class TestDatabaseConnectionPooling:
     """Test database connection pooling configuration."""
     
-    def test_sqlite_pooling_config(self):
+    def test_sqlite_pooling_config(self, sqlite_engine):
         """Test SQLite-specific pooling configuration."""
-        engine = create_engine("sqlite+aiosqlite:///./test.db")
-        assert engine is not None
+        assert sqlite_engine is not None
         # SQLite should use StaticPool
     
     def test_postgresql_pooling_config(self):
@@ -148,77 +184,57 @@ class TestDatabaseConnectionPooling:
 class TestDatabaseEventListeners:
     """Test database event listeners."""
     
-    def test_sqlite_pragma_listener(self):
+    def test_sqlite_pragma_listener(self, sqlite_engine):
         """Test SQLite pragma event listener."""
         # This is more of an integration test
         # The listener should be attached when creating SQLite engines
-        engine = create_engine("sqlite+aiosqlite:///./test.db")
         
         # Check that the engine has event listeners
         # This is difficult to test directly, so we just ensure
         # the engine is created without errors
-        assert engine is not None
+        assert sqlite_engine is not None
     
-    def test_connection_checkout_listener(self):
+    def test_connection_checkout_listener(self, sqlite_engine):
         """Test connection checkout event listener."""
-        engine = create_engine("sqlite+aiosqlite:///./test.db")
-        
         # The listener should be attached
         # This is mainly tested through integration
-        assert engine is not None
+        assert sqlite_engine is not None
 
 
-@pytest.fixture
-async def database_session():
+@pytest_asyncio.fixture
+async def database_session(initialized_database):
     """Fixture providing a test database session."""
-    await init_database("sqlite+aiosqlite:///./test.db", create_tables=True)
-    
     async with get_session() as session:
         yield session
-    
-    await close_database()
 
 
 class TestDatabaseIntegration:
     """Integration tests for database functionality."""
     
-    def test_database_session_fixture(self, database_session):
+    @pytest.mark.asyncio
+    async def test_database_session_fixture(self, database_session):
         """Test database session fixture creation (simplified test)."""
-        # Just test that the fixture provides something
-        assert database_session is not None
+        assert isinstance(database_session, AsyncSession)
     
     @pytest.mark.asyncio
-    async def test_session_transaction_rollback(self):
+    async def test_session_transaction_rollback(self, initialized_database):
         """Test session transaction rollback on error."""
-        await init_database("sqlite+aiosqlite:///./test.db", create_tables=True)
-        
-        try:
+        with pytest.raises(Exception, match="Test error"):
             async with get_session() as session:
                 # This should work
-                await session.execute("SELECT 1")
+                await session.execute(_SELECT_ONE)
                 # Force an error to test rollback
                 raise Exception("Test error")
-        except Exception:
-            pass  # Expected
-        
-        # Session should be properly cleaned up
-        await close_database()
     
     @pytest.mark.asyncio
-    async def test_multiple_concurrent_sessions(self):
+    async def test_multiple_concurrent_sessions(self, initialized_database):
         """Test multiple concurrent database sessions."""
-        await init_database("sqlite+aiosqlite:///./test.db", create_tables=True)
-        
         async def query_database():
+            # Each task opens its own session; sessions are not shared
             async with get_session() as session:
-                from sqlalchemy import text
-                result = await session.execute(text("SELECT 1"))
+                result = await session.execute(_SELECT_ONE)
                 return result.scalar()
         
-        # Run multiple concurrent queries
-        tasks = [query_database() for _ in range(5)]
-        results = await asyncio.gather(*tasks)
-        
-        assert all(result == 1 for result in results)
+        results = await asyncio.gather(*(query_database() for _ in range(5)))
         
-        await close_database()
\ No newline at end of file
+        assert results == [1] * 5
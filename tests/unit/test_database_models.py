@@ -6,63 +6,91 @@ These can be adapted for your specific domain models.
 """
 
 import pytest
-from datetime import datetime, timedelta
-from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime, timezone
 
 from src.database.models import User, Post, UserStatus
 
 
+# Constructor arguments shared by the model factories below
+USER_KWARGS = {
+    "username": "testuser",
+    "email": "test@example.com",
+    "hashed_password": "hashed_password_123",
+}
+
+POST_KWARGS = {
+    "title": "Test Post",
+    "content": "This is test content",
+    "author_id": "user_123",
+    "view_count": 0,  # Set explicitly for testing
+}
+
+
+# Clock value returned while time is frozen
+FROZEN_NOW = datetime(2024, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+
+
+class _FrozenDatetime(datetime):
+    """datetime whose clock methods always return FROZEN_NOW."""
+    
+    @classmethod
+    def now(cls, tz=None):
+        return FROZEN_NOW if tz else FROZEN_NOW.replace(tzinfo=None)
+    
+    @classmethod
+    def utcnow(cls):
+        return FROZEN_NOW.replace(tzinfo=None)
+
+
+@pytest.fixture
+def frozen_time(monkeypatch):
+    """Freeze the clock used by model and mixin methods."""
+    monkeypatch.setattr("src.database.models.datetime", _FrozenDatetime)
+    monkeypatch.setattr("src.database.base.datetime", _FrozenDatetime)
+    return FROZEN_NOW
+
+
+@pytest.fixture
+def make_user():
+    """Factory building a fresh User from the shared arguments."""
+    def factory(**overrides):
+        return User(**{**USER_KWARGS, **overrides})
+    return factory
+
+
+@pytest.fixture
+def make_post():
+    """Factory building a fresh Post from the shared arguments."""
+    def factory(**overrides):
+        return Post(**{**POST_KWARGS, **overrides})
+    return factory
+
+
 class TestUserModel:
     """Test User model functionality."""
     
-    def test_user_creation(self):
+    def test_user_creation(self, make_user):
         """Test creating a user instance."""
-        # Create a mock user with the expected attributes
-        from unittest.mock import Mock
-        user = Mock()
-        user.username = "testuser"
-        user.email = "test@example.com"
-        user.hashed_password = "hashed_password_123"
+        user = make_user()
         
         assert user.username == "testuser"
         assert user.email == "test@example.com"
         assert user.hashed_password == "hashed_password_123"
         
         # Test with explicit values
-        user_with_defaults = Mock()
-        user_with_defaults.username = "testuser2"
-        user_with_defaults.email = "test2@example.com"
-        user_with_defaults.hashed_password = "hashed_password_123"
-        user_with_defaults.status = UserStatus.PENDING.value
-        user_with_defaults.is_active = True
+        user_with_defaults = make_user(
+            username="testuser2",
+            email="test2@example.com",
+            status=UserStatus.PENDING.value,
+            is_active=True
+        )
         
         assert user_with_defaults.status == UserStatus.PENDING.value
         assert user_with_defaults.is_active is True
     
-    def test_user_to_dict_excludes_sensitive_fields(self):
+    def test_user_to_dict_excludes_sensitive_fields(self, make_user):
         """Test that to_dict excludes sensitive fields."""
-        from unittest.mock import Mock
-        user = Mock()
-        user.username = "testuser"
-        user.email = "test@example.com"
-        user.hashed_password = "hashed_password_123"
-        
-        # Mock the to_dict method to simulate the expected behavior
-        def mock_to_dict(exclude=None, include_relationships=False):
-            data = {
-                "username": user.username,
-                "email": user.email,
-                "is_active": True
-            }
-            # Exclude sensitive fields by default
-            if exclude is None:
-                exclude = {'hashed_password'}
-            for field in exclude:
-                data.pop(field, None)
-            return data
-        
-        user.to_dict = mock_to_dict
-        user_dict = user.to_dict()
+        user_dict = make_user().to_dict()
         
         # Should include basic fields
         assert user_dict["username"] == "testuser"
@@ -70,20 +98,36 @@ class TestUserModel:
         
         # Should exclude sensitive fields
         assert "hashed_password" not in user_dict
+    
+    @pytest.mark.parametrize(
+        "operations,expected_deleted",
+        [
+            ((), False),
+            (("soft_delete",), True),
+            (("soft_delete", "restore"), False),
+        ],
+        ids=["fresh", "soft_delete", "restore"],
+    )
+    def test_user_soft_delete_state(
+        self, make_user, frozen_time, operations, expected_deleted
+    ):
+        """Test soft deletion flags for each state transition."""
+        user = make_user()
+        
+        for operation in operations:
+            getattr(user, operation)()
+        
+        assert bool(user.is_deleted) is expected_deleted
+        expected_deleted_at = frozen_time.replace(tzinfo=None) if expected_deleted else None
+        assert user.deleted_at == expected_deleted_at
 
 
 class TestPostModel:
     """Test Post model functionality."""
     
-    def test_post_creation(self):
+    def test_post_creation(self, make_post):
         """Test creating a post instance."""
-        post = Post(
-            title="Test Post",
-            content="This is test content",
-            author_id="user_123",
-            is_published=False,  # Set explicitly for testing
-            view_count=0  # Set explicitly for testing
-        )
+        post = make_post(is_published=False)  # Set explicitly for testing
         
         assert post.title == "Test Post"
         assert post.content == "This is test content"
@@ -91,59 +135,38 @@ class TestPostModel:
         assert post.is_published is False  # Default value
         assert post.view_count == 0  # Default value
     
-    def test_post_publish(self):
-        """Test publishing a post."""
-        post = Post(
-            title="Test Post",
-            content="This is test content",
-            author_id="user_123"
-        )
-        
-        # Initially not published
-        assert not post.is_published
-        assert post.published_at is None
-        
-        # Publish the post
-        post.publish()
-        
-        assert post.is_published
-        assert post.published_at is not None
-    
-    def test_post_unpublish(self):
-        """Test unpublishing a post."""
-        post = Post(
-            title="Test Post",
-            content="This is test content",
-            author_id="user_123"
-        )
-        
-        # First publish it
-        post.publish()
-        assert post.is_published
-        
-        # Then unpublish
-        post.unpublish()
-        assert not post.is_published
-        assert post.published_at is None
-    
-    def test_post_increment_view_count(self):
-        """Test incrementing view count."""
-        post = Post(
-            title="Test Post",
-            content="This is test content",
-            author_id="user_123",
-            view_count=0  # Set explicitly for testing
-        )
-        
-        # Initially zero views
-        assert post.view_count == 0
-        
-        # Increment views
-        post.increment_view_count()
-        assert post.view_count == 1
-        
-        post.increment_view_count()
-        assert post.view_count == 2
+    @pytest.mark.parametrize(
+        "operations,expected_published,expected_published_at,expected_views",
+        [
+            (("publish",), True, FROZEN_NOW, 0),
+            (("publish", "unpublish"), False, None, 0),
+            (("increment_view_count",) * 2, False, None, 2),
+        ],
+        ids=["publish", "unpublish", "increment_view_count"],
+    )
+    def test_post_lifecycle(
+        self,
+        make_post,
+        frozen_time,
+        operations,
+        expected_published,
+        expected_published_at,
+        expected_views,
+    ):
+        """Test post state transitions."""
+        fresh_post = make_post()
+        
+        # Initially unpublished with no views
+        assert not fresh_post.is_published
+        assert fresh_post.published_at is None
+        assert fresh_post.view_count == 0
+        
+        for operation in operations:
+            getattr(fresh_post, operation)()
+        
+        assert bool(fresh_post.is_published) is expected_published
+        assert fresh_post.published_at == expected_published_at
+        assert fresh_post.view_count == expected_views
 
 
 class TestModelEnums:
@@ -151,32 +174,24 @@ class TestModelEnums:
     
     def test_user_status_enum(self):
         """Test UserStatus enumeration."""
-        assert UserStatus.ACTIVE.value == "active"
-        assert UserStatus.INACTIVE.value == "inactive"
-        assert UserStatus.PENDING.value == "pending"
+        # One comparison covers every member, including unexpected additions
+        assert {member: member.value for member in UserStatus} == {
+            UserStatus.ACTIVE: "active",
+            UserStatus.INACTIVE: "inactive",
+            UserStatus.PENDING: "pending",
+        }
 
 
 class TestModelRelationships:
     """Test model relationships."""
     
-    def test_user_post_relationship(self):
+    def test_user_post_relationship(self, make_user, make_post):
         """Test User-Post relationship."""
-        from unittest.mock import Mock
-        user = Mock()
-        user.id = "user_123"
-        user.username = "testuser"
-        user.email = "test@example.com"
-        user.hashed_password = "hashed_password_123"
-        
-        post = Mock()
-        post.id = "post_123"
-        post.title = "Test Post"
-        post.content = "This is test content"
-        post.author_id = user.id
+        user = make_user(id="user_123")
+        post = make_post(id="post_123", author_id=user.id)
         
-        # Set up the relationship (normally done by SQLAlchemy)
+        # Assigning one side populates the back reference
         post.author = user
-        user.posts = [post]
         
-        assert post.author == user
-        assert post in user.posts
\ No newline at end of file
+        assert post.author is user
+        assert post in user.posts
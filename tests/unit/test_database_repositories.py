@@ -1,9 +1,15 @@
 """
 Tests for database repositories.
+
+Every test runs against a mocked session, so the module has no shared
+external state and its tests can be spread freely across xdist workers.
+The module-scoped mocks are per worker process and are reset after each
+test, so no xdist_group is needed.
 """
 
 import pytest
-from unittest.mock import AsyncMock, Mock, patch
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock, call
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 
@@ -16,132 +22,187 @@ from src.database.repositories import (
     NotFoundError,
     DuplicateError,
 )
-from src.database.models import User, Post, UserStatus
+from src.database.models import User, Post
 
 
 # Use the actual User model for testing instead of a mock
 # This ensures we're testing with real SQLAlchemy model behavior
 
 
+# Unique-constraint failure raised by the duplicate-creation test
+_INTEGRITY_ERR = IntegrityError("", "", "")
+
+
+def _make_session():
+    """
+    Build a mock AsyncSession with only the methods repositories call.
+    
+    Children are configured explicitly instead of being derived from the
+    AsyncSession spec on first access.
+    """
+    session = Mock(spec=AsyncSession)
+    session.add = Mock()
+    session.execute = AsyncMock()
+    session.flush = AsyncMock()
+    session.refresh = AsyncMock()
+    session.rollback = AsyncMock()
+    session.commit = AsyncMock()
+    session.close = AsyncMock()
+    return session
+
+
+def _stub_execute(session, **results):
+    """
+    Configure session.execute to return a plain result stub.
+    
+    Keywords name result methods (scalar, scalar_one_or_none), use
+    scalars_all for result.scalars().all(), or set rowcount directly.
+    """
+    result = SimpleNamespace()
+    for name, value in results.items():
+        if name == "scalars_all":
+            result.scalars = lambda value=value: SimpleNamespace(all=lambda: value)
+        elif name == "rowcount":
+            result.rowcount = value
+        else:
+            setattr(result, name, lambda value=value: value)
+    session.execute.return_value = result
+    return result
+
+
+@pytest.fixture(scope="module")
+def mock_session():
+    """Mock AsyncSession shared by the tests in this module."""
+    return _make_session()
+
+
+@pytest.fixture(autouse=True)
+def reset_mock_session(mock_session):
+    """Clear recorded calls and configured results after each test."""
+    yield
+    mock_session.reset_mock(return_value=True, side_effect=True)
+
+
+@pytest.fixture(scope="module")
+def sample_user():
+    """User instance shared by lookup tests; never mutated."""
+    return User(username="testuser", email="test@example.com", hashed_password="hashed")
+
+
+@pytest.fixture
+def new_user():
+    """Stand-in instance returned by the fake model constructor."""
+    return Mock(
+        id="new_id",
+        username="testuser",
+        email="test@example.com",
+        hashed_password="hashed_password"
+    )
+
+
+@pytest.fixture
+def fake_model_cls(new_user):
+    """Model class stand-in whose constructor returns ``new_user``."""
+    return Mock(return_value=new_user, __name__="User")
+
+
+@pytest.fixture(scope="module")
+def repository(mock_session):
+    """BaseRepository instance with mock session."""
+    return BaseRepository(mock_session, User)
+
+
+@pytest.fixture(scope="module")
+def user_repository(mock_session):
+    """UserRepository instance with mock session."""
+    return UserRepository(mock_session)
+
+
+@pytest.fixture(scope="module")
+def post_repository(mock_session):
+    """PostRepository instance with mock session."""
+    return PostRepository(mock_session)
+
+
+@pytest.fixture(scope="module")
+def repository_factory(mock_session):
+    """RepositoryFactory instance with mock session."""
+    return RepositoryFactory(mock_session)
+
+
 class TestBaseRepository:
     """Test BaseRepository functionality."""
     
-    @pytest.fixture
-    def mock_session(self):
-        """Mock AsyncSession."""
-        return AsyncMock(spec=AsyncSession)
-    
-    @pytest.fixture
-    def repository(self, mock_session):
-        """BaseRepository instance with mock session."""
-        return BaseRepository(mock_session, User)
-    
     @pytest.mark.asyncio
-    async def test_create_success(self, repository, mock_session):
+    async def test_create_success(self, mock_session, fake_model_cls, new_user):
         """Test successful record creation."""
-        # Create a mock user instance
-        mock_user = Mock()
-        mock_user.id = "new_id"
-        mock_user.username = "testuser"
-        mock_user.email = "test@example.com"
-        mock_user.hashed_password = "hashed_password"
+        repository = BaseRepository(mock_session, fake_model_cls)
+        
+        result = await repository.create(
+            username="testuser",
+            email="test@example.com",
+            hashed_password="hashed_password"
+        )
+        
+        assert result is new_user
+        # The session records its children's calls in order
+        assert mock_session.mock_calls == [
+            call.add(new_user),
+            call.flush(),
+            call.refresh(new_user),
+        ]
+    
+    @pytest.mark.asyncio
+    async def test_create_duplicate_error(self, mock_session, fake_model_cls):
+        """Test creation with duplicate constraint violation."""
+        repository = BaseRepository(mock_session, fake_model_cls)
         
-        # Mock session methods
-        mock_session.add = Mock()
-        mock_session.flush = AsyncMock()
-        mock_session.refresh = AsyncMock()
+        # Make the flush hit a unique constraint
+        mock_session.flush.side_effect = _INTEGRITY_ERR
         
-        # Mock the User constructor to return our mock instance
-        with patch.object(User, '__new__', return_value=mock_user):
-            result = await repository.create(
+        with pytest.raises(DuplicateError):
+            await repository.create(
                 username="testuser",
                 email="test@example.com",
                 hashed_password="hashed_password"
             )
-            
-            mock_session.add.assert_called_once_with(mock_user)
-            mock_session.flush.assert_called_once()
-            mock_session.refresh.assert_called_once_with(mock_user)
-    
-    @pytest.mark.asyncio
-    async def test_create_duplicate_error(self, repository, mock_session):
-        """Test creation with duplicate constraint violation."""
-        # Create a mock user instance
-        mock_user = Mock()
-        mock_user.id = "new_id"
-        mock_user.username = "testuser"
-        mock_user.email = "test@example.com"
-        mock_user.hashed_password = "hashed_password"
-        
-        # Mock session methods
-        mock_session.add = Mock()
-        mock_session.flush = AsyncMock(side_effect=IntegrityError("", "", ""))
-        mock_session.rollback = AsyncMock()
-        
-        # Mock the User constructor to return our mock instance
-        with patch.object(User, '__new__', return_value=mock_user):
-            with pytest.raises(DuplicateError):
-                await repository.create(
-                    username="testuser",
-                    email="test@example.com",
-                    hashed_password="hashed_password"
-                )
-        
-        mock_session.rollback.assert_called_once()
         
         mock_session.rollback.assert_called_once()
     
     @pytest.mark.asyncio
-    async def test_get_by_id_found(self, repository, mock_session):
-        """Test getting record by ID when found."""
+    @pytest.mark.parametrize("found", [True, False], ids=["found", "not_found"])
+    async def test_get_by_id(self, repository, mock_session, found):
+        """Test getting record by ID when found and when missing."""
         mock_user = Mock()
         mock_user.id = "test_id"
         mock_user.username = "testuser"
         mock_user.email = "test@example.com"
         mock_user.hashed_password = "hashed_password"
+        expected = mock_user if found else None
         
-        mock_result = Mock()
-        mock_result.scalar_one_or_none.return_value = mock_user
-        mock_session.execute = AsyncMock(return_value=mock_result)
+        _stub_execute(mock_session, scalar_one_or_none=expected)
         
         result = await repository.get_by_id("test_id")
         
-        assert result == mock_user
+        assert result is expected
         mock_session.execute.assert_called_once()
     
     @pytest.mark.asyncio
-    async def test_get_by_id_not_found(self, repository, mock_session):
-        """Test getting record by ID when not found."""
-        mock_result = Mock()
-        mock_result.scalar_one_or_none.return_value = None
-        mock_session.execute = AsyncMock(return_value=mock_result)
-        
-        result = await repository.get_by_id("nonexistent_id")
-        
-        assert result is None
-    
-    @pytest.mark.asyncio
-    async def test_get_by_id_or_raise_found(self, repository, mock_session):
-        """Test getting record by ID or raise when found."""
-        mock_user = Mock()
-        mock_user.id = "test_id"
-        mock_user.username = "testuser"
-        mock_user.email = "test@example.com"
-        mock_user.hashed_password = "hashed_password"
-        
-        with patch.object(repository, 'get_by_id', return_value=mock_user):
-            result = await repository.get_by_id_or_raise("test_id")
-            assert result == mock_user
-    
-    @pytest.mark.asyncio
-    async def test_get_by_id_or_raise_not_found(self, repository, mock_session):
-        """Test getting record by ID or raise when not found."""
-        with patch.object(repository, 'get_by_id', return_value=None):
+    @pytest.mark.parametrize("found", [True, False], ids=["found", "not_found"])
+    async def test_get_by_id_or_raise(self, repository, sample_user, monkeypatch, found):
+        """Test getting record by ID or raise when found and when missing."""
+        monkeypatch.setattr(
+            repository, "get_by_id", AsyncMock(return_value=sample_user if found else None)
+        )
+        
+        if found:
+            assert await repository.get_by_id_or_raise("test_id") is sample_user
+        else:
             with pytest.raises(NotFoundError):
                 await repository.get_by_id_or_raise("nonexistent_id")
     
     @pytest.mark.asyncio
-    async def test_update_success(self, repository, mock_session):
+    async def test_update_success(self, repository, mock_session, monkeypatch):
         """Test successful record update."""
         mock_user = Mock()
         mock_user.id = "test_id"
@@ -149,38 +210,28 @@ class TestBaseRepository:
         mock_user.email = "test@example.com"
         mock_user.hashed_password = "hashed_password"
         
-        with patch.object(repository, 'get_by_id_or_raise', return_value=mock_user):
-            mock_session.flush = AsyncMock()
-            mock_session.refresh = AsyncMock()
-            
-            result = await repository.update("test_id", username="new_username")
-            
-            assert result.username == "new_username"
-            mock_session.flush.assert_called_once()
-            mock_session.refresh.assert_called_once()
-    
-    @pytest.mark.asyncio
-    async def test_delete_success(self, repository, mock_session):
-        """Test successful record deletion."""
-        mock_result = Mock()
-        mock_result.rowcount = 1
-        mock_session.execute = AsyncMock(return_value=mock_result)
+        monkeypatch.setattr(
+            repository, "get_by_id_or_raise", AsyncMock(return_value=mock_user)
+        )
         
-        result = await repository.delete("test_id")
+        result = await repository.update("test_id", username="new_username")
         
-        assert result is True
-        mock_session.execute.assert_called_once()
+        assert result.username == "new_username"
+        mock_session.flush.assert_called_once()
+        mock_session.refresh.assert_called_once()
     
     @pytest.mark.asyncio
-    async def test_delete_not_found(self, repository, mock_session):
-        """Test deletion when record not found."""
-        mock_result = Mock()
-        mock_result.rowcount = 0
-        mock_session.execute = AsyncMock(return_value=mock_result)
+    @pytest.mark.parametrize(
+        "rowcount,expected", [(1, True), (0, False)], ids=["deleted", "not_found"]
+    )
+    async def test_delete(self, repository, mock_session, rowcount, expected):
+        """Test record deletion reports whether a row was removed."""
+        _stub_execute(mock_session, rowcount=rowcount)
         
-        result = await repository.delete("nonexistent_id")
+        result = await repository.delete("test_id")
         
-        assert result is False
+        assert result is expected
+        mock_session.execute.assert_called_once()
     
     @pytest.mark.asyncio
     async def test_list_all(self, repository, mock_session):
@@ -194,11 +245,7 @@ class TestBaseRepository:
             mock_user.hashed_password = "hashed_password"
             mock_users.append(mock_user)
             
-        mock_result = Mock()
-        mock_scalars = Mock()
-        mock_scalars.all.return_value = mock_users
-        mock_result.scalars.return_value = mock_scalars
-        mock_session.execute = AsyncMock(return_value=mock_result)
+        _stub_execute(mock_session, scalars_all=mock_users)
         
         result = await repository.list_all(limit=10, offset=0)
         
@@ -208,82 +255,42 @@ class TestBaseRepository:
     @pytest.mark.asyncio
     async def test_count(self, repository, mock_session):
         """Test counting records."""
-        mock_result = Mock()
-        mock_result.scalar.return_value = 5
-        mock_session.execute = AsyncMock(return_value=mock_result)
+        _stub_execute(mock_session, scalar=5)
         
         result = await repository.count()
         
         assert result == 5
     
     @pytest.mark.asyncio
-    async def test_exists_true(self, repository, mock_session):
-        """Test checking if record exists (true case)."""
-        mock_result = Mock()
-        mock_result.scalar.return_value = 1
-        mock_session.execute = AsyncMock(return_value=mock_result)
+    @pytest.mark.parametrize(
+        "scalar_value,expected", [(1, True), (0, False)], ids=["exists", "missing"]
+    )
+    async def test_exists(self, repository, mock_session, scalar_value, expected):
+        """Test checking if record exists."""
+        _stub_execute(mock_session, scalar=scalar_value)
         
         result = await repository.exists("test_id")
         
-        assert result is True
-    
-    @pytest.mark.asyncio
-    async def test_exists_false(self, repository, mock_session):
-        """Test checking if record exists (false case)."""
-        mock_result = Mock()
-        mock_result.scalar.return_value = 0
-        mock_session.execute = AsyncMock(return_value=mock_result)
-        
-        result = await repository.exists("nonexistent_id")
-        
-        assert result is False
+        assert result is expected
 
 
 class TestUserRepository:
     """Test UserRepository functionality."""
     
-    @pytest.fixture
-    def mock_session(self):
-        """Mock AsyncSession."""
-        return AsyncMock(spec=AsyncSession)
-    
-    @pytest.fixture
-    def user_repository(self, mock_session):
-        """UserRepository instance with mock session."""
-        return UserRepository(mock_session)
-    
     @pytest.mark.asyncio
-    async def test_get_by_username(self, user_repository, mock_session):
-        """Test getting user by username."""
-        mock_user = Mock()
-        mock_user.username = "testuser"
-        mock_user.email = "test@example.com"
-        mock_user.hashed_password = "hashed"
-        
-        mock_result = Mock()
-        mock_result.scalar_one_or_none.return_value = mock_user
-        mock_session.execute = AsyncMock(return_value=mock_result)
-        
-        result = await user_repository.get_by_username("testuser")
-        
-        assert result == mock_user
-        mock_session.execute.assert_called_once()
-    
-    @pytest.mark.asyncio
-    async def test_get_by_email(self, user_repository, mock_session):
-        """Test getting user by email."""
-        mock_user = Mock()
-        mock_user.username = "testuser"
-        mock_user.email = "test@example.com"
-        mock_user.hashed_password = "hashed"
-        
-        mock_result = Mock()
-        mock_result.scalar_one_or_none.return_value = mock_user
-        mock_session.execute = AsyncMock(return_value=mock_result)
-        
-        result = await user_repository.get_by_email("test@example.com")
-        
-        assert result == mock_user
+    @pytest.mark.parametrize(
+        "method,value",
+        [("get_by_username", "testuser"), ("get_by_email", "test@example.com")],
+    )
+    async def test_get_by_unique_field(
+        self, user_repository, mock_session, sample_user, method, value
+    ):
+        """Test getting user by username and by email."""
+        _stub_execute(mock_session, scalar_one_or_none=sample_user)
+        
+        result = await getattr(user_repository, method)(value)
+        
+        assert result is sample_user
         mock_session.execute.assert_called_once()
     
     @pytest.mark.asyncio
@@ -298,11 +305,7 @@ class TestUserRepository:
             mock_user.is_active = True
             mock_users.append(mock_user)
         
-        mock_result = Mock()
-        mock_scalars = Mock()
-        mock_scalars.all.return_value = mock_users
-        mock_result.scalars.return_value = mock_scalars
-        mock_session.execute = AsyncMock(return_value=mock_result)
+        _stub_execute(mock_session, scalars_all=mock_users)
         
         result = await user_repository.get_active_users()
         
@@ -311,41 +314,33 @@ class TestUserRepository:
         mock_session.execute.assert_called_once()
     
     @pytest.mark.asyncio
-    async def test_create_user(self, user_repository, mock_session):
+    async def test_create_user(self, user_repository, monkeypatch):
         """Test creating a new user."""
         mock_user = Mock()
         mock_user.username = "testuser"
         mock_user.email = "test@example.com"
         mock_user.hashed_password = "hashed"
         
-        with patch.object(user_repository, 'create', return_value=mock_user) as mock_create:
-            result = await user_repository.create(
-                username="testuser",
-                email="test@example.com",
-                hashed_password="hashed"
-            )
-            
-            assert result == mock_user
-            mock_create.assert_called_once_with(
-                username="testuser",
-                email="test@example.com",
-                hashed_password="hashed"
-            )
+        mock_create = AsyncMock(return_value=mock_user)
+        monkeypatch.setattr(user_repository, "create", mock_create)
+        
+        result = await user_repository.create(
+            username="testuser",
+            email="test@example.com",
+            hashed_password="hashed"
+        )
+        
+        assert result == mock_user
+        mock_create.assert_called_once_with(
+            username="testuser",
+            email="test@example.com",
+            hashed_password="hashed"
+        )
 
 
 class TestPostRepository:
     """Test PostRepository functionality."""
     
-    @pytest.fixture
-    def mock_session(self):
-        """Mock AsyncSession."""
-        return AsyncMock(spec=AsyncSession)
-    
-    @pytest.fixture
-    def post_repository(self, mock_session):
-        """PostRepository instance with mock session."""
-        return PostRepository(mock_session)
-    
     @pytest.mark.asyncio
     async def test_get_by_author(self, post_repository, mock_session):
         """Test getting posts by author."""
@@ -354,11 +349,7 @@ class TestPostRepository:
         mock_post.content = "Test content"
         mock_post.author_id = "user_123"
         
-        mock_result = Mock()
-        mock_scalars = Mock()
-        mock_scalars.all.return_value = [mock_post]
-        mock_result.scalars.return_value = mock_scalars
-        mock_session.execute = AsyncMock(return_value=mock_result)
+        _stub_execute(mock_session, scalars_all=[mock_post])
         
         result = await post_repository.get_by_author("user_123")
         
@@ -375,11 +366,7 @@ class TestPostRepository:
         mock_post.author_id = "user_123"
         mock_post.is_published = True
         
-        mock_result = Mock()
-        mock_scalars = Mock()
-        mock_scalars.all.return_value = [mock_post]
-        mock_result.scalars.return_value = mock_scalars
-        mock_session.execute = AsyncMock(return_value=mock_result)
+        _stub_execute(mock_session, scalars_all=[mock_post])
         
         result = await post_repository.get_published_posts()
         
@@ -392,16 +379,6 @@ class TestPostRepository:
 class TestRepositoryFactory:
     """Test RepositoryFactory functionality."""
     
-    @pytest.fixture
-    def mock_session(self):
-        """Mock AsyncSession."""
-        return AsyncMock(spec=AsyncSession)
-    
-    @pytest.fixture
-    def repository_factory(self, mock_session):
-        """RepositoryFactory instance with mock session."""
-        return RepositoryFactory(mock_session)
-    
     def test_users_property(self, repository_factory):
         """Test users repository property."""
         users_repo = repository_factory.users
@@ -418,47 +395,33 @@ class TestRepositoryFactory:
 class TestRepositoryExceptions:
     """Test repository exception classes."""
     
-    def test_repository_error(self):
-        """Test RepositoryError exception."""
-        error = RepositoryError("Test error")
-        assert str(error) == "Test error"
-        assert isinstance(error, Exception)
-    
-    def test_not_found_error(self):
-        """Test NotFoundError exception."""
-        error = NotFoundError("Record not found")
-        assert str(error) == "Record not found"
-        assert isinstance(error, RepositoryError)
-    
-    def test_duplicate_error(self):
-        """Test DuplicateError exception."""
-        error = DuplicateError("Duplicate record")
-        assert str(error) == "Duplicate record"
-        assert isinstance(error, RepositoryError)
+    @pytest.mark.parametrize(
+        "error_class,message,parent",
+        [
+            (RepositoryError, "Test error", Exception),
+            (NotFoundError, "Record not found", RepositoryError),
+            (DuplicateError, "Duplicate record", RepositoryError),
+        ],
+    )
+    def test_exception(self, error_class, message, parent):
+        """Test repository exception messages and hierarchy."""
+        error = error_class(message)
+        assert str(error) == message
+        assert isinstance(error, parent)
 
 
 class TestRepositoryIntegration:
     """Integration tests for repository functionality."""
     
-    @pytest.mark.asyncio
-    async def test_repository_with_real_models(self):
-        """Test repository with actual model instances."""
-        mock_session = AsyncMock(spec=AsyncSession)
-        user_repo = UserRepository(mock_session)
-        
-        # Test that repository is properly initialized
-        assert user_repo.session == mock_session
-        assert user_repo.model_class == User
-    
-    @pytest.mark.asyncio
-    async def test_multiple_repositories_same_session(self):
-        """Test multiple repositories sharing the same session."""
-        mock_session = AsyncMock(spec=AsyncSession)
-        
+    def test_repository_with_real_models(self, mock_session):
+        """Test repositories bind real models and share one session."""
         user_repo = UserRepository(mock_session)
         post_repo = PostRepository(mock_session)
         
+        # Test that repositories are properly initialized
+        assert user_repo.model_class is User
+        assert post_repo.model_class is Post
+        
         # Both repositories should share the same session
-        assert user_repo.session == mock_session
-        assert post_repo.session == mock_session
-        assert user_repo.session == post_repo.session
\ No newline at end of file
+        assert user_repo.session is mock_session
+        assert post_repo.session is user_repo.session
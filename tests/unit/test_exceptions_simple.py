@@ -5,14 +5,9 @@ This module tests the custom exception classes without requiring
 the full configuration system.
 """
 
-import os
 import pytest
 from unittest.mock import Mock, patch
 
-# Skip configuration validation and initialization for tests
-os.environ["SKIP_CONFIG_VALIDATION"] = "1"
-os.environ["SKIP_CONFIG_INIT"] = "1"
-
 from src.schemas.base import ErrorDetail
 
 
@@ -5,16 +5,11 @@ This module tests the error handling middleware without requiring
 the full configuration system.
 """
 
-import os
 import uuid
 from unittest.mock import Mock, patch
 from fastapi import FastAPI, Request
 from fastapi.testclient import TestClient
 
-# Skip configuration validation and initialization for tests
-os.environ["SKIP_CONFIG_VALIDATION"] = "1"
-os.environ["SKIP_CONFIG_INIT"] = "1"
-
 from src.middleware.error_handling import (
     CorrelationIDMiddleware,
     RequestLoggingMiddleware,
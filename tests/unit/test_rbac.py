@@ -5,16 +5,11 @@ This module tests the RBAC system including roles, permissions,
 and access control decorators.
 """
 
-import os
 import pytest
 from unittest.mock import Mock
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.testclient import TestClient
 
-# Skip configuration validation and initialization for tests
-os.environ["SKIP_CONFIG_VALIDATION"] = "1"
-os.environ["SKIP_CONFIG_INIT"] = "1"
-
 from src.auth.rbac import (
     Permission,
     Role,
@@ -5,16 +5,11 @@ This module tests the security middleware components including
 security headers, rate limiting, and trusted hosts.
 """
 
-import os
 import pytest
 from unittest.mock import Mock, patch
 from fastapi import FastAPI, Request
 from fastapi.testclient import TestClient
 
-# Skip configuration validation and initialization for tests
-os.environ["SKIP_CONFIG_VALIDATION"] = "1"
-os.environ["SKIP_CONFIG_INIT"] = "1"
-
 from src.middleware.security import (
     SecurityHeadersMiddleware,
     RateLimitMiddleware,
@@ -159,10 +154,9 @@ class TestRateLimitMiddleware:
         
         client = TestClient(app)
         
-        # Make multiple requests
-        for _ in range(10):
-            response = client.get("/test")
-            assert response.status_code == 200
+        # Make multiple requests and check them together
+        status_codes = [client.get("/test").status_code for _ in range(10)]
+        assert status_codes == [200] * 10
     
     def test_rate_limiting_headers(self):
         """Test that rate limiting headers are added."""
@@ -6,12 +6,6 @@ import pytest
 from datetime import datetime
 from pydantic import ValidationError
 
-# Set test environment before importing
-import os
-os.environ["API_ENV"] = "test"
-os.environ["SKIP_CONFIG_INIT"] = "1"
-os.environ["SKIP_CONFIG_VALIDATION"] = "1"
-
 from src.schemas.base import (
     BaseSchema,
     PaginationParams,
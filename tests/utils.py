@@ -13,7 +13,7 @@ import json
 import logging
 import os
 import tempfile
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Union
 from unittest.mock import AsyncMock, Mock
@@ -22,14 +22,11 @@ import pytest
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
 from httpx import AsyncClient
-from sqlalchemy import create_engine, text
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
-# Test environment setup
-os.environ["API_ENV"] = "test"
-os.environ["SKIP_CONFIG_INIT"] = "1"
-os.environ["SKIP_CONFIG_VALIDATION"] = "1"
+# How far in the past expired test tokens are stamped
+EXPIRED_TOKEN_AGE = timedelta(hours=1)
 
 
 class DatabaseTestHelper:
@@ -472,10 +469,9 @@ class SecurityTestHelper:
     ) -> str:
         """Create an expired JWT token for testing."""
         import jwt
-        from datetime import timedelta
         
         # Set expiration to 1 hour ago
-        payload["exp"] = datetime.utcnow() - timedelta(hours=1)
+        payload["exp"] = datetime.now(timezone.utc) - EXPIRED_TOKEN_AGE
         return jwt.encode(payload, secret, algorithm=algorithm)
     
     @staticmethod